@@ -3,24 +3,30 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
+import os
+import threading
 import time
 import random
 import warnings
+from resampling import HierarchicalResampler, NIVEAUX, choisir_niveau
+from correlation import CrossCorrelationEngine
+from export import ExportPipeline
+from api import DashboardQueryAPI, serve
+from reference import get_reference_data
+from live_feed import LiveFeedConsumer, LocalPublisher
+from trade_matrix import TradeMatrix, FLUX
+from seasonal import SeasonalDecomposer
+from session_memory import SessionStateManager
+from validation import DataQualityValidator
+from vintages import VintageStore
+from sketches import InvestmentSketches
+from shared_data import DatasetLoader
+from figures import DashboardFigures
 warnings.filterwarnings('ignore')
 
-# Configuration de la page
-st.set_page_config(
-    page_title="Dashboard Économique Île Maurice - Analyse en Temps Réel",
-    page_icon="🏝️",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
 # CSS personnalisé
-st.markdown("""
+CSS_PERSONNALISE = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -91,100 +97,58 @@ st.markdown("""
         border-radius: 2px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+def configure_page():
+    """Configure la page et le CSS (uniquement lorsque le dashboard est servi par Streamlit)"""
+    # Configuration de la page
+    st.set_page_config(
+        page_title="Dashboard Économique Île Maurice - Analyse en Temps Réel",
+        page_icon="🏝️",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    # CSS personnalisé
+    st.markdown(CSS_PERSONNALISE, unsafe_allow_html=True)
+
+DATASETS = ['economic_data', 'tourism_data', 'tourism_markets', 'trade_data', 'investment_data']
+# Jeux alimentés par le flux live : le commerce et le tourisme ont des ventilations
+# (matrice produits × partenaires, marchés émetteurs) que les agrégats reçus ne permettent pas de prolonger
+DATASETS_LIVE = ['economic_data']
+# Colonnes dérivées, recalculées après fusion des lignes reçues
+COLONNES_DERIVEES = {
+    'trade_data': {'balance_commerciale': lambda df: df['exportations'] - df['importations']},
+}
 
 class MauritiusDashboard:
-    def __init__(self):
+    def __init__(self, donnees_partagees=None):
+        self.reference = get_reference_data()
         self.secteurs = self.define_secteurs()
-        self.economic_data = self.initialize_economic_data()
-        self.tourism_data = self.initialize_tourism_data()
-        self.trade_data = self.initialize_trade_data()
-        self.investment_data = self.initialize_investment_data()
+        self.figures = DashboardFigures(self.reference)
+        self.derniere_mise_a_jour = datetime.now()
+        self.donnees_partagees = DatasetLoader(donnees_partagees) if donnees_partagees else None
+        if self.donnees_partagees is None:
+            self.economic_data = self.initialize_economic_data()
+            self.tourism_data, self.tourism_markets = self.initialize_tourism_data()
+            self.trade_data = self.initialize_trade_data()
+            self.trade_matrix = self.initialize_trade_matrix()
+            self.investment_data = self.initialize_investment_data()
+        else:
+            self.attach_shared_data()
+        self.investment_sketches = self.build_investment_sketches()
+        self.resampler = self.build_resampler()
+        self.correlations = CrossCorrelationEngine(max_lag=12)
+        self.tourism_decomposition = SeasonalDecomposer()
+        self.quality = self.validate_initial_data()
+        if self.donnees_partagees is None:
+            self.vintages = self.build_vintages()
+        self._verrou = threading.Lock()
+        self._verrou_analyses = threading.Lock()  # Synchronisation des corrélations et décompositions
         
     def define_secteurs(self):
-        """Définit les secteurs économiques de l'Île Maurice"""
-        return {
-            'Tourisme': {
-                'nom_complet': 'Tourisme et Hôtellerie',
-                'poids_pib': 24.3,
-                'croissance': 8.7,
-                'emplois': 75000,
-                'couleur': '#EA2839',
-                'description': 'Premier secteur économique du pays',
-                'entreprises_cles': ['Beachcomber', 'Sun Resorts', 'Veranda', 'LUX*'],
-                'perspectives': 'Très positives'
-            },
-            'Services Financiers': {
-                'nom_complet': 'Services Financiers et Bancaires',
-                'poids_pib': 12.8,
-                'croissance': 5.2,
-                'emplois': 15000,
-                'couleur': '#1A206D',
-                'description': 'Centre financier international',
-                'entreprises_cles': ['MCB', 'SBM', 'MUA', 'CIM'],
-                'perspectives': 'Stables'
-            },
-            'Textile': {
-                'nom_complet': 'Industrie Textile et Habillement',
-                'poids_pib': 8.5,
-                'croissance': 3.1,
-                'emplois': 45000,
-                'couleur': '#FF6B00',
-                'description': 'Exportations vers UE et USA',
-                'entreprises_cles': ['CIEL Textile', 'Floréal', 'Made in Moris'],
-                'perspectives': 'En croissance modérée'
-            },
-            'Sucre': {
-                'nom_complet': 'Industrie Sucrière',
-                'poids_pib': 6.2,
-                'croissance': -2.1,
-                'emplois': 15000,
-                'couleur': '#FFD100',
-                'description': 'Tradition historique en mutation',
-                'entreprises_cles': ['Omnicane', 'Alteo', 'TERRÉA'],
-                'perspectives': 'En restructuration'
-            },
-            'Technologie': {
-                'nom_complet': 'Technologies de l\'Information',
-                'poids_pib': 7.3,
-                'croissance': 15.4,
-                'emplois': 12000,
-                'couleur': '#00A3E0',
-                'description': 'Secteur en forte croissance',
-                'entreprises_cles': ['Accenture', 'CERNE', 'IFSS', 'Cim'],
-                'perspectives': 'Très positives'
-            },
-            'Immobilier': {
-                'nom_complet': 'Immobilier et Construction',
-                'poids_pib': 9.1,
-                'croissance': 6.8,
-                'emplois': 35000,
-                'couleur': '#8B4513',
-                'description': 'Programme IRS/REIS très actif',
-                'entreprises_cles': ['Rogers', 'IBL', 'Gamma Civic'],
-                'perspectives': 'Positives'
-            },
-            'Commerce': {
-                'nom_complet': 'Commerce de Détail et Distribution',
-                'poids_pib': 11.2,
-                'croissance': 4.3,
-                'emplois': 55000,
-                'couleur': '#6f42c1',
-                'description': 'Réseaux de distribution développés',
-                'entreprises_cles': ['Jumbo', 'Super U', 'Winner\'s', 'Shoprite'],
-                'perspectives': 'Stables'
-            },
-            'Pêche': {
-                'nom_complet': 'Pêche et Aquaculture',
-                'poids_pib': 4.1,
-                'croissance': 7.2,
-                'emplois': 12000,
-                'couleur': '#0066CC',
-                'description': 'Thon et produits de la mer',
-                'entreprises_cles': ['Mormaï', 'Seafood Hub', 'Fishing Co'],
-                'perspectives': 'En croissance'
-            }
-        }
+        """Définit les secteurs économiques de l'Île Maurice (registre de référence)"""
+        return self.reference.secteurs_dict
     
     def initialize_economic_data(self):
         """Initialise les données économiques historiques"""
@@ -221,19 +185,14 @@ class MauritiusDashboard:
         return pd.DataFrame(data)
     
     def initialize_tourism_data(self):
-        """Initialise les données touristiques"""
+        """Initialise les données touristiques, globales et par marché émetteur"""
         dates = pd.date_range('2014-01-01', datetime.now(), freq='M')
+        base_marches = self.reference.arrivees_annuelles_normales / 12 * self.reference.marches_touristiques['part']
+        saisonnalite = self.reference.saisonnalite_marches
         data = []
+        data_marches = []
         
         for date in dates:
-            # Saisonnalité touristique
-            if date.month in [12, 1, 2, 7, 8]:  # Haute saison
-                base_touristes = 150000
-            elif date.month in [3, 4, 9, 10]:   # Moyenne saison
-                base_touristes = 100000
-            else:                               # Basse saison
-                base_touristes = 70000
-            
             # Impact COVID
             if date.year == 2020 or (date.year == 2021 and date.month <= 6):
                 covid_factor = random.uniform(0.05, 0.15)  # 5-15% de la normale
@@ -244,7 +203,9 @@ class MauritiusDashboard:
             else:
                 covid_factor = random.uniform(1.0, 1.2)    # Retour à la normale
             
-            touristes = base_touristes * covid_factor
+            # Arrivées par marché : part habituelle × saisonnalité propre au marché
+            arrivees = base_marches * saisonnalite[date.month] * covid_factor * np.random.uniform(0.9, 1.1, len(base_marches))
+            touristes = arrivees.sum()
             recettes = touristes * random.uniform(1200, 1800)  # Dépense moyenne par touriste
             
             data.append({
@@ -253,17 +214,15 @@ class MauritiusDashboard:
                 'recettes_tourisme': recettes,
                 'duree_sejour_moyenne': random.uniform(8, 12),
                 'taux_occupation_hotels': random.uniform(0.6, 0.9) * covid_factor,
-                'principaux_marches': random.choice(['France', 'Royaume-Uni', 'Allemagne', 'Afrique du Sud'])
+                'principaux_marches': arrivees.idxmax()
             })
+            data_marches.append({'date': date, **arrivees.to_dict()})
         
-        return pd.DataFrame(data)
+        return pd.DataFrame(data), pd.DataFrame(data_marches)
     
     def initialize_trade_data(self):
         """Initialise les données commerciales"""
         dates = pd.date_range('2014-01-01', datetime.now(), freq='M')
-        produits_export = ['Textile', 'Sucre', 'Poisson', 'Fleurs', 'Bijoux', 'Médicaments']
-        produits_import = ['Pétrole', 'Machines', 'Voitures', 'Riz', 'Produits chimiques']
-        partenaires = ['UE', 'USA', 'Afrique du Sud', 'Inde', 'Chine', 'Madagascar']
         
         data = []
         for date in dates:
@@ -276,14 +235,39 @@ class MauritiusDashboard:
                 'date': date,
                 'exportations': export_total,
                 'importations': import_total,
-                'balance_commerciale': export_total - import_total,
-                'principal_produit_export': random.choice(produits_export),
-                'principal_produit_import': random.choice(produits_import),
-                'principal_partenaire': random.choice(partenaires)
+                'balance_commerciale': export_total - import_total
             })
         
         return pd.DataFrame(data)
     
+    def initialize_trade_matrix(self):
+        """Ventile les échanges de chaque mois par produit et par partenaire"""
+        produits = self.reference.produits_commerce
+        affinites = self.reference.affinites_partenaires.to_numpy()
+        rng = np.random.default_rng()
+        nb_mois = len(self.trade_data)
+        
+        # Parts tirées autour des parts habituelles (Dirichlet vectorisée via des lois gamma)
+        poids = rng.gamma(produits['poids'].to_numpy() * 50, size=(nb_mois, len(produits)))
+        repartition = rng.gamma(affinites * 50, size=(nb_mois,) + affinites.shape)
+        repartition /= repartition.sum(axis=2, keepdims=True)
+        
+        cube = np.zeros((nb_mois, len(produits), len(self.reference.partenaires), len(FLUX)))
+        for code_flux, (flux, colonne) in enumerate(zip(FLUX, ['exportations', 'importations'])):
+            parts = poids * (produits['flux'] == flux).to_numpy()
+            parts /= parts.sum(axis=1, keepdims=True)
+            total = self.trade_data[colonne].to_numpy()
+            cube[..., code_flux] = total[:, None, None] * parts[:, :, None] * repartition
+        
+        matrice = TradeMatrix.from_cube(self.trade_data['date'], produits.index, self.reference.partenaires, cube)
+        
+        # Libellés principaux cohérents avec le détail
+        self.trade_data['principal_produit_export'] = matrice.principal('export')[0]
+        self.trade_data['principal_produit_import'] = matrice.principal('import')[0]
+        self.trade_data['principal_partenaire'] = matrice.principal()[1]
+        
+        return matrice
+    
     def initialize_investment_data(self):
         """Initialise les données d'investissement"""
         types_investissement = ['IRS', 'REIS', 'PDS', 'Fintech', 'Manufacturing', 'Tourisme', 'Immobilier']
@@ -304,31 +288,187 @@ class MauritiusDashboard:
                 'statut': random.choices(['Approuvé', 'En cours', 'Terminé'], weights=[0.3, 0.5, 0.2])[0]
             })
         
-        return pd.DataFrame(data)
+        return pd.DataFrame(data).sort_values('date_approbation').reset_index(drop=True)
     
-    def update_live_data(self):
-        """Met à jour les données en temps réel"""
-        # Simulation de mises à jour économiques
-        dernier_pib = self.economic_data.iloc[-1]['croissance_pib']
-        nouvelle_croissance = dernier_pib + random.uniform(-0.1, 0.1)
-        
-        # Ajout de nouvelles données mensuelles si nécessaire
-        derniere_date = self.economic_data['date'].max()
-        if datetime.now() - derniere_date > timedelta(days=30):
-            nouvelle_date = derniere_date + timedelta(days=30)
-            
-            nouvelle_ligne = {
-                'date': nouvelle_date,
-                'pib_mensuel': self.economic_data.iloc[-1]['pib_mensuel'] * (1 + nouvelle_croissance/100),
-                'croissance_pib': nouvelle_croissance,
-                'inflation': random.uniform(2.5, 5.5),
-                'taux_chomage': random.uniform(6.5, 8.5),
-                'taux_change_usd': random.uniform(38, 42),
-                'reserves_devises': random.uniform(6, 7.5),
-                'dette_publique': random.uniform(65, 72)
-            }
+    def shared_tables(self):
+        """Tables et attributs à publier pour les workers (voir shared_data.py)"""
+        matrice = self.trade_matrix
+        tables = {nom: getattr(self, nom) for nom in DATASETS}
+        # Millésimes tenus par le seul processus de publication, partagés avec les workers
+        tables.update(self.vintages.to_tables())
+        tables['trade_cells'] = pd.DataFrame({
+            'code_mois': matrice.code_mois, 'code_produit': matrice.code_produit,
+            'code_partenaire': matrice.code_partenaire, 'code_flux': matrice.code_flux, 'valeurs': matrice.valeurs
+        })
+        tables['trade_mois'] = pd.DataFrame({'mois': matrice.mois.astype('datetime64[ns]')})
+        attributs = {
+            'produits': matrice.produits,
+            'partenaires': matrice.partenaires,
+            'derniere_mise_a_jour': self.derniere_mise_a_jour.isoformat()
+        }
+        return tables, attributs
+    
+    def attach_shared_data(self):
+        """Jeux de données et millésimes attachés en lecture seule depuis la version publiée courante"""
+        tables, attributs = self.donnees_partagees.attach()
+        for nom in DATASETS:
+            setattr(self, nom, tables[nom])
+        cellules = tables['trade_cells']
+        self.trade_matrix = TradeMatrix(tables['trade_mois']['mois'].to_numpy(), attributs['produits'], attributs['partenaires'],
+                                        *(cellules[colonne].to_numpy() for colonne in cellules.columns))
+        self.derniere_mise_a_jour = datetime.fromisoformat(attributs['derniere_mise_a_jour'])
+        self.vintages = VintageStore.from_tables(tables)
+    
+    def refresh_shared_data(self):
+        """Bascule sur la dernière version publiée, si elle a changé (appelé à chaque rerun)"""
+        if self.donnees_partagees is None or not self.donnees_partagees.changed():
+            return False
+        
+        with self._verrou:
+            self.attach_shared_data()
+            self.investment_sketches = self.build_investment_sketches()
+            for nom in DATASETS:
+                self.resampler.replace(nom, getattr(self, nom))
+            self.quality = self.validate_initial_data()
+        return True
+    
+    def build_investment_sketches(self):
+        """Top-k et esquisses de quantiles des projets"""
+        sketches = InvestmentSketches(k=10)
+        sketches.add_frame(self.investment_data)
+        return sketches
+    
+    def build_resampler(self):
+        """Matérialise les niveaux mensuel, trimestriel et annuel de chaque jeu de données"""
+        resampler = HierarchicalResampler()
+        
+        resampler.register('economic_data', self.economic_data, 'date', {
+            'pib_mensuel': ('pib_mensuel', 'sum'),
+            'croissance_pib': ('croissance_pib', 'mean'),
+            'inflation': ('inflation', 'mean'),
+            'taux_chomage': ('taux_chomage', 'mean'),
+            'taux_change_usd': ('taux_change_usd', 'mean'),
+            'reserves_devises': ('reserves_devises', 'last'),  # Encours en fin de période
+            'dette_publique': ('dette_publique', 'last')
+        })
+        resampler.register('tourism_data', self.tourism_data, 'date', {
+            'arrivees_touristes': ('arrivees_touristes', 'sum'),
+            'recettes_tourisme': ('recettes_tourisme', 'sum'),
+            'duree_sejour_moyenne': ('duree_sejour_moyenne', 'mean'),
+            'taux_occupation_hotels': ('taux_occupation_hotels', 'mean'),
+            'principaux_marches': ('principaux_marches', 'last')
+        })
+        resampler.register('tourism_markets', self.tourism_markets, 'date', {
+            marche: (marche, 'sum') for marche in self.reference.marches_touristiques.index
+        })
+        resampler.register('trade_data', self.trade_data, 'date', {
+            'exportations': ('exportations', 'sum'),
+            'importations': ('importations', 'sum'),
+            'balance_commerciale': ('balance_commerciale', 'sum'),
+            'principal_produit_export': ('principal_produit_export', 'last'),
+            'principal_produit_import': ('principal_produit_import', 'last'),
+            'principal_partenaire': ('principal_partenaire', 'last')
+        })
+        resampler.register('investment_data', self.investment_data, 'date_approbation', {
+            'montant_usd_millions': ('montant_usd_millions', 'sum'),
+            'emplois_crees': ('emplois_crees', 'sum'),
+            'nombre_projets': ('type_investissement', 'count')
+        }, continu=False)  # Approbations : table d'événements, pas une série mensuelle
+        
+        return resampler
+    
+    def validate_initial_data(self):
+        """Contrôle qualité de l'historique complet, une seule fois au chargement"""
+        quality = DataQualityValidator()
+        for nom in self.resampler.versions:
+            quality.validate(nom, getattr(self, nom), 'date_approbation' if nom == 'investment_data' else 'date')
+        return quality
+    
+    def build_vintages(self):
+        """Premier millésime de chaque jeu de données"""
+        vintages = VintageStore()
+        for nom in self.resampler.versions:
+            vintages.commit(nom, getattr(self, nom), cle='date_approbation' if nom == 'investment_data' else 'date')
+        return vintages
+    
+    def get_correlations(self):
+        """Corrélations entre indicateurs, recalculées seulement quand les données changent"""
+        jeux = ['economic_data', 'tourism_data', 'trade_data']
+        
+        # Vérification et mise à jour indivisibles : sessions, API et export appellent en parallèle
+        with self._verrou_analyses:
+            version = tuple(self.resampler.versions[nom] for nom in jeux)
+            if self.correlations.version != version:
+                # Alignement mensuel de toutes les colonnes numériques
+                indicateurs = None
+                for nom in jeux:
+                    mensuel = self.resampler.level(nom, 'M').set_index('date').select_dtypes('number')
+                    indicateurs = mensuel if indicateurs is None else indicateurs.join(mensuel, how='inner')
+                self.correlations.sync(indicateurs.dropna(), version)
+        
+        return self.correlations
+    
+    def get_tourism_decomposition(self):
+        """Décomposition saisonnière par marché, mise à jour seulement quand les données changent"""
+        with self._verrou_analyses:
+            version = self.resampler.versions['tourism_markets']
+            if self.tourism_decomposition.version != version:
+                self.tourism_decomposition.sync(self.resampler.level('tourism_markets', 'M').set_index('date'), version)
+        return self.tourism_decomposition
+    
+    def data_version(self, jeux=None):
+        """Versions des jeux de données (tous par défaut), clé des résultats mis en cache"""
+        versions = self.resampler.versions
+        return tuple((nom, versions[nom]) for nom in sorted(versions if jeux is None else jeux))
+    
+    def session_cached(self, nom, parametres, calcul, jeux=()):
+        """Résultat propre à la session courante, conservé dans la limite du budget mémoire
+
+        Seules les versions des jeux de données lus par la vue (`jeux`) valident
+        l'entrée : une mise à jour d'un autre jeu ne l'invalide pas, et le résultat
+        recalculé remplace celui de la version précédente.
+        """
+        return get_session_manager().get_or_compute(current_session_id(), (nom, parametres), calcul,
+                                                    self.data_version(jeux))
+    
+    def ingest(self, nom, lignes):
+        """Intègre des lignes reçues du flux live (appelé par le consommateur, hors rendu)
+
+        Les dates sont ramenées à la fin de leur mois (une ligne par période). Les
+        colonnes absentes d'une nouvelle période reprennent la dernière valeur
+        connue ; une période existante est révisée. Le jeu de données est remplacé
+        en bloc, les sessions lisent donc toujours une version complète.
+
+        Seuls les jeux de `DATASETS_LIVE` sont acceptés (ValueError sinon).
+        """
+        if nom not in DATASETS_LIVE:
+            raise ValueError(f"Jeu de données non alimenté par le flux live: {nom}")
+        
+        with self._verrou:
+            actuel = getattr(self, nom)
+            existant = actuel.set_index('date')
+            lignes = (lignes.assign(date=pd.to_datetime(lignes['date']).dt.normalize() + pd.offsets.MonthEnd(0))
+                      .groupby('date').last())
             
-            self.economic_data = pd.concat([self.economic_data, pd.DataFrame([nouvelle_ligne])], ignore_index=True)
+            # Valeurs de référence : même période si elle existe, sinon la précédente
+            reference = existant.reindex(lignes.index, method='ffill')
+            lignes = lignes.combine_first(reference)[existant.columns].reset_index()
+            for colonne, calcul in COLONNES_DERIVEES.get(nom, {}).items():
+                lignes[colonne] = calcul(lignes)
+            
+            # Nouvelle version construite entièrement avant de remplacer quoi que ce soit
+            nouveau = (pd.concat([actuel[~actuel['date'].isin(lignes['date'])], lignes])
+                       .sort_values('date').reset_index(drop=True))
+            self.resampler.append(nom, lignes, remplacer=True)
+            setattr(self, nom, nouveau)
+            
+            # Nouveau millésime (fusionné par fenêtre) : seuls les blocs à partir de la première période reçue sont réexaminés
+            self.vintages.commit(nom, nouveau, depuis=int(nouveau['date'].searchsorted(lignes['date'].min())),
+                                 provisoire=True)
+            self.derniere_mise_a_jour = datetime.now()
+            
+            # Contrôle des seules lignes reçues, une fois la version en place ; les anomalies sont signalées, pas rejetées
+            self.quality.validate(nom, lignes)
     
     def display_header(self):
         """Affiche l'en-tête du dashboard"""
@@ -342,7 +482,7 @@ class MauritiusDashboard:
             st.markdown("**Surveillance et analyse des performances économiques de l'Île Maurice**")
             st.markdown('<div class="mauritius-flag"></div>', unsafe_allow_html=True)
         
-        current_time = datetime.now().strftime('%H:%M:%S')
+        current_time = self.derniere_mise_a_jour.strftime('%H:%M:%S')
         st.sidebar.markdown(f"**🕐 Dernière mise à jour: {current_time}**")
     
     def display_key_metrics(self):
@@ -354,6 +494,8 @@ class MauritiusDashboard:
         derniere_data = self.economic_data.iloc[-1]
         derniers_touristes = self.tourism_data.iloc[-1]
         derniers_echanges = self.trade_data.iloc[-1]
+        trimestres = self.resampler.level('economic_data', 'Q', complets=True)
+        variation_trimestrielle = trimestres['croissance_pib'].iloc[-1] - trimestres['croissance_pib'].iloc[-2]
         
         col1, col2, col3, col4 = st.columns(4)
         
@@ -361,7 +503,7 @@ class MauritiusDashboard:
             st.metric(
                 "Croissance du PIB",
                 f"{derniere_data['croissance_pib']:.1f}%",
-                f"{random.uniform(-0.5, 0.5):.1f}% vs trimestre précédent"
+                f"{variation_trimestrielle:+.1f}% vs trimestre précédent"
             )
         
         with col2:
@@ -387,120 +529,221 @@ class MauritiusDashboard:
                 f"{'Excédent' if balance_commerciale > 0 else 'Déficit'}"
             )
     
-    def create_economic_overview(self):
+    def display_quality_flags(self, noms, date_debut, date_fin):
+        """Signale les anomalies de qualité des jeux de données affichés sur la période"""
+        rapport = pd.concat([self.quality.report(nom, date_debut, date_fin) for nom in noms], ignore_index=True)
+        if rapport.empty:
+            return
+        
+        erreurs = (rapport['gravite'] == 'erreur').sum()
+        with st.expander(f"⚠️ {len(rapport)} anomalie(s) de qualité sur la période, dont {erreurs} erreur(s)"):
+            st.dataframe(rapport, use_container_width=True, hide_index=True)
+    
+    def overview_tables(self, date_debut, date_fin):
+        """Données de la vue d'ensemble, à la granularité adaptée à la période"""
+        # Granularité choisie d'après la période : les longues périodes sont agrégées
+        economic, niveau = self.resampler.slice('economic_data', date_debut, date_fin)
+        trade, _ = self.resampler.slice('trade_data', date_debut, date_fin, niveau)
+        tourism, _ = self.resampler.slice('tourism_data', date_debut, date_fin, niveau)
+        
+        return {
+            'economie': economic,
+            'commerce': trade,
+            'tourisme': tourism,
+            # Répartition du PIB par secteur
+            'secteurs': self.reference.secteurs[['poids_pib', 'croissance', 'emplois']].reset_index(),
+            'correlations': self.get_correlations().correlation(0)
+        }
+    
+    def correlation_tables(self, decalage=0):
+        """Corrélations pour un décalage, et corrélation maximale tous décalages confondus"""
+        correlations = self.get_correlations()
+        valeurs, meilleurs_decalages = correlations.strongest()
+        return {
+            'correlation': correlations.correlation(decalage),
+            'correlation_max': valeurs,
+            'decalage_max': meilleurs_decalages
+        }
+    
+    def revision_figures(self, indicateur, moment, date_debut, date_fin):
+        """Comparaison d'un indicateur tel que connu à un instant donné et dans sa dernière version"""
+        ancien = self.vintages.vintage_at('economic_data', moment)
+        actuel = self.vintages.latest('economic_data')
+        periode = lambda df: df[(df['date'] >= pd.Timestamp(date_debut)) & (df['date'] <= pd.Timestamp(date_fin))]
+        
+        versions = pd.concat([
+            periode(self.vintages.get('economic_data', ancien, ['date', indicateur])).assign(millesime=f"Au {pd.Timestamp(moment):%d/%m %H:%M:%S}"),
+            periode(self.vintages.get('economic_data', actuel, ['date', indicateur])).assign(millesime='Dernière version')
+        ])
+        revisions = self.vintages.diff('economic_data', ancien, actuel)
+        revisions = periode(revisions[revisions['colonne'] == indicateur])
+        
+        return {
+            'versions_indicateur': px.line(versions, x='date', y=indicateur, color='millesime',
+                                           title=f'{indicateur.replace("_", " ").title()} : millésimes comparés',
+                                           color_discrete_sequence=['#AAAAAA', '#EA2839']),
+            'revisions_indicateur': px.bar(revisions, x='date', y='revision',
+                                           title=f'Révisions depuis le millésime choisi ({len(revisions)} périodes)',
+                                           color='revision', color_continuous_scale='RdBu')
+        }
+    
+    def trade_detail_tables(self, flux, produit, date_debut, date_fin):
+        """Principaux partenaires d'un produit et parts des échanges par partenaire, sur la période"""
+        return {
+            'top_partenaires': self.trade_matrix.top_partners(produit, date_debut, date_fin, k=6),
+            'parts_partenaires': self.trade_matrix.share_of_trade(flux, 'partenaire', date_debut, date_fin)
+        }
+    
+    def tourism_market_tables(self, marche, date_debut, date_fin):
+        """Arrivées par marché et composantes saisonnières du marché choisi, sur la période"""
+        marches, _ = self.resampler.slice('tourism_markets', date_debut, date_fin)
+        composantes = self.get_tourism_decomposition().component(marche)
+        return {
+            'marches': marches,
+            'composantes': composantes[(composantes['date'] >= pd.Timestamp(date_debut)) & 
+                                       (composantes['date'] <= pd.Timestamp(date_fin))]
+        }
+    
+    def create_economic_overview(self, controls):
         """Crée la vue d'ensemble économique"""
         st.markdown('<h3 class="section-header">🏛️ VUE D\'ENSEMBLE ÉCONOMIQUE</h3>', 
                    unsafe_allow_html=True)
         
-        tab1, tab2, tab3, tab4 = st.tabs(["Indicateurs Macro", "Secteurs Économiques", "Commerce Extérieur", "Tourisme"])
+        periode = (controls['date_debut'], controls['date_fin'])
+        figures = self.session_cached('overview', periode,
+                                      lambda: self.figures.overview_figures(self.overview_tables(*periode)),
+                                      ['economic_data', 'trade_data', 'tourism_data'])
+        niveau = choisir_niveau(controls['date_debut'], controls['date_fin'])
+        st.caption(f"Granularité : {NIVEAUX[niveau]}")
+        
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(["Indicateurs Macro", "Secteurs Économiques", "Commerce Extérieur", "Tourisme", "Corrélations"])
         
         with tab1:
             col1, col2 = st.columns(2)
             
             with col1:
-                # Évolution du PIB
-                fig = px.line(self.economic_data, 
-                             x='date', 
-                             y='croissance_pib',
-                             title='Évolution de la Croissance du PIB (%)',
-                             color_discrete_sequence=['#1A206D'])
-                fig.add_hline(y=0, line_dash="dash", line_color="red")
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['croissance_pib'], use_container_width=True)
             
             with col2:
-                # Inflation et chômage
-                fig = make_subplots(specs=[[{"secondary_y": True}]])
-                fig.add_trace(
-                    go.Scatter(x=self.economic_data['date'], y=self.economic_data['inflation'],
-                              name="Inflation", line=dict(color='#EA2839')),
-                    secondary_y=False,
-                )
-                fig.add_trace(
-                    go.Scatter(x=self.economic_data['date'], y=self.economic_data['taux_chomage'],
-                              name="Chômage", line=dict(color='#FFD100')),
-                    secondary_y=True,
-                )
-                fig.update_layout(title_text="Inflation et Taux de Chômage")
-                fig.update_yaxes(title_text="Inflation (%)", secondary_y=False)
-                fig.update_yaxes(title_text="Chômage (%)", secondary_y=True)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['inflation_chomage'], use_container_width=True)
+            
+            self.display_quality_flags(['economic_data'], *periode)
+            
+            # Comparaison des millésimes
+            with st.expander("🕰️ Révisions des indicateurs"):
+                millesimes = self.vintages.vintages('economic_data')
+                if len(millesimes) < 2:
+                    st.info("Aucune révision depuis le chargement des données")
+                else:
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        indicateur = st.selectbox("Indicateur:", [c for c in self.economic_data.select_dtypes('number').columns],
+                                                  key='revision_indicateur')
+                    
+                    with col2:
+                        # Au plus 50 millésimes proposés, répartis sur tout l'historique
+                        horodatages = millesimes['horodatage'].iloc[:-1]
+                        positions = np.unique(np.linspace(0, len(horodatages) - 1, min(len(horodatages), 50)).round().astype(int))
+                        moment = st.select_slider("Millésime de référence:", options=list(horodatages.iloc[positions]),
+                                                  format_func=lambda h: h.strftime('%d/%m %H:%M:%S'))
+                    
+                    figures_revision = self.session_cached('revisions', (indicateur, moment) + periode,
+                                                           lambda: self.revision_figures(indicateur, moment, *periode),
+                                                           ['economic_data'])
+                    st.plotly_chart(figures_revision['versions_indicateur'], use_container_width=True)
+                    st.plotly_chart(figures_revision['revisions_indicateur'], use_container_width=True)
+                    st.caption(f"{len(millesimes)} millésimes conservés")
         
         with tab2:
             col1, col2 = st.columns(2)
             
             with col1:
-                # Répartition du PIB par secteur
-                secteur_data = []
-                for secteur, info in self.secteurs.items():
-                    secteur_data.append({
-                        'secteur': secteur,
-                        'poids_pib': info['poids_pib'],
-                        'croissance': info['croissance'],
-                        'emplois': info['emplois']
-                    })
-                
-                df_secteurs = pd.DataFrame(secteur_data)
-                fig = px.pie(df_secteurs, 
-                            values='poids_pib', 
-                            names='secteur',
-                            title='Répartition du PIB par Secteur (%)',
-                            color='secteur',
-                            color_discrete_map={secteur: info['couleur'] for secteur, info in self.secteurs.items()})
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['repartition_pib'], use_container_width=True)
             
             with col2:
-                # Croissance par secteur
-                fig = px.bar(df_secteurs, 
-                            x='secteur', 
-                            y='croissance',
-                            title='Taux de Croissance par Secteur (%)',
-                            color='secteur',
-                            color_discrete_map={secteur: info['couleur'] for secteur, info in self.secteurs.items()})
-                fig.add_hline(y=0, line_dash="dash", line_color="red")
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['croissance_secteurs'], use_container_width=True)
         
         with tab3:
             col1, col2 = st.columns(2)
             
             with col1:
-                # Évolution du commerce extérieur
-                fig = px.line(self.trade_data, 
-                             x='date', 
-                             y=['exportations', 'importations'],
-                             title='Évolution des Exportations et Importations (Md USD)',
-                             color_discrete_map={'exportations': '#28a745', 'importations': '#EA2839'})
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['commerce_exterieur'], use_container_width=True)
             
             with col2:
-                # Balance commerciale
-                fig = px.area(self.trade_data, 
-                             x='date', 
-                             y='balance_commerciale',
-                             title='Balance Commerciale (Md USD)',
-                             color_discrete_sequence=['#1A206D'])
-                fig.add_hline(y=0, line_dash="dash", line_color="red")
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['balance_commerciale'], use_container_width=True)
+            
+            self.display_quality_flags(['trade_data'], *periode)
+            
+            # Détail produit × partenaire
+            st.markdown("**🔎 Détail par produit et partenaire**")
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                flux = st.radio("Flux:", FLUX, horizontal=True,
+                                format_func=lambda f: 'Exportations' if f == 'export' else 'Importations')
+            
+            with col2:
+                produits = self.reference.produits_commerce
+                produit = st.selectbox("Produit:", list(produits.index[produits['flux'] == flux]))
+            
+            figures_detail = self.session_cached('trade_detail', (flux, produit) + periode,
+                                                lambda: self.figures.trade_detail_figures(self.trade_detail_tables(flux, produit, *periode), flux, produit),
+                                                ['trade_data'])
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.plotly_chart(figures_detail['top_partenaires'], use_container_width=True)
+            
+            with col2:
+                st.plotly_chart(figures_detail['parts_partenaires'], use_container_width=True)
         
         with tab4:
             col1, col2 = st.columns(2)
             
             with col1:
-                # Arrivées touristiques
-                fig = px.line(self.tourism_data, 
-                             x='date', 
-                             y='arrivees_touristes',
-                             title='Évolution des Arrivées Touristiques Mensuelles',
-                             color_discrete_sequence=['#FF6B00'])
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['arrivees_touristes'], use_container_width=True)
+            
+            with col2:
+                st.plotly_chart(figures['recettes_tourisme'], use_container_width=True)
+            
+            self.display_quality_flags(['tourism_data', 'tourism_markets'], *periode)
+            
+            # Marchés émetteurs et décomposition saisonnière
+            st.markdown("**🧭 Décomposition saisonnière par marché**")
+            marche = st.selectbox("Marché émetteur:", list(self.reference.marches_touristiques.index))
+            figures_marche = self.session_cached('tourism_market', (marche,) + periode,
+                                                lambda: self.figures.tourism_market_figures(self.tourism_market_tables(marche, *periode), marche),
+                                                ['tourism_markets'])
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.plotly_chart(figures_marche['arrivees_par_marche'], use_container_width=True)
+                st.plotly_chart(figures_marche['saisonnalite_marche'], use_container_width=True)
+            
+            with col2:
+                st.plotly_chart(figures_marche['tendance_marche'], use_container_width=True)
+                st.plotly_chart(figures_marche['residu_marche'], use_container_width=True)
+        
+        with tab5:
+            decalage = st.slider("Décalage (mois) : l'indicateur en ligne précède celui en colonne", 
+                                 0, self.correlations.max_lag, 0)
+            figures_correlation = self.session_cached('correlation', (decalage,), lambda: self.figures.correlation_figures(self.correlation_tables(decalage), decalage),
+                                                      ['economic_data', 'tourism_data', 'trade_data'])
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.plotly_chart(figures_correlation['correlations'], use_container_width=True)
             
             with col2:
-                # Recettes touristiques
-                fig = px.line(self.tourism_data, 
-                             x='date', 
-                             y='recettes_tourisme',
-                             title='Évolution des Recettes Touristiques (Millions USD)',
-                             color_discrete_sequence=['#FFD100'])
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures_correlation['correlations_max'], use_container_width=True)
+    
+    def sectors_tables(self):
+        """Données d'emploi par secteur (parts précalculées par le registre)"""
+        return {'emploi': self.reference.secteurs[['emplois', 'part_emploi_total']].reset_index()}
     
     def create_sectors_analysis(self):
         """Analyse détaillée par secteur"""
@@ -550,35 +793,15 @@ class MauritiusDashboard:
         
         with tab2:
             # Emploi par secteur
-            emploi_data = []
-            for secteur, info in self.secteurs.items():
-                emploi_data.append({
-                    'secteur': secteur,
-                    'emplois': info['emplois'],
-                    'part_emploi_total': (info['emplois'] / sum([s['emplois'] for s in self.secteurs.values()])) * 100
-                })
-            
-            df_emploi = pd.DataFrame(emploi_data)
+            figures = self.session_cached('sectors', (), lambda: self.figures.sectors_figures(self.sectors_tables()))
             
             col1, col2 = st.columns(2)
             
             with col1:
-                fig = px.bar(df_emploi, 
-                            x='secteur', 
-                            y='emplois',
-                            title='Nombre d\'Emplois par Secteur',
-                            color='secteur',
-                            color_discrete_map={secteur: info['couleur'] for secteur, info in self.secteurs.items()})
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['emplois_par_secteur'], use_container_width=True)
             
             with col2:
-                fig = px.pie(df_emploi, 
-                            values='part_emploi_total', 
-                            names='secteur',
-                            title='Répartition de l\'Emploi par Secteur (%)',
-                            color='secteur',
-                            color_discrete_map={secteur: info['couleur'] for secteur, info in self.secteurs.items()})
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['repartition_emploi'], use_container_width=True)
         
         with tab3:
             # Carte des entreprises mauriciennes
@@ -598,6 +821,42 @@ class MauritiusDashboard:
             df_entreprises = pd.DataFrame(entreprises_data)
             st.dataframe(df_entreprises, use_container_width=True)
     
+    def investment_tables(self, pays=None):
+        """Agrégats des projets d'investissement (top-k et quantiles tirés des esquisses, filtrables par pays)"""
+        # Investissements par type
+        invest_par_type = self.investment_data.groupby('type_investissement').agg({
+            'montant_usd_millions': 'sum',
+            'emplois_crees': 'sum'
+        }).reset_index()
+        
+        # Investissements par pays
+        invest_par_pays = self.investment_data.groupby('pays_origine').agg({
+            'montant_usd_millions': 'sum',
+            'emplois_crees': 'sum'
+        }).reset_index()
+        
+        # Analyse par secteur d'investissement
+        invest_par_secteur = self.investment_data.groupby('secteur').agg({
+            'montant_usd_millions': ['sum', 'count'],
+            'emplois_crees': 'sum'
+        }).round(2)
+        invest_par_secteur.columns = ['montant_total', 'nombre_projets', 'emplois_total']
+        invest_par_secteur = invest_par_secteur.reset_index()
+        
+        return {
+            'par_type': invest_par_type,
+            # Évolution temporelle des investissements (niveau annuel pré-calculé)
+            'annuel': self.resampler.level('investment_data', 'Y'),
+            'par_pays': invest_par_pays,
+            # Top 10 des plus gros investissements et distributions par pays
+            'top_investissements': self.investment_sketches.top('montant_usd_millions', pays_origine=pays),
+            'distribution_montants': self.investment_sketches.distribution('montant_usd_millions', 'pays_origine',
+                                                                           pays_origine=pays),
+            'percentiles_emplois': self.investment_sketches.distribution('emplois_crees', 'pays_origine',
+                                                                         (0.1, 0.25, 0.5, 0.75, 0.9), pays_origine=pays),
+            'par_secteur': invest_par_secteur
+        }
+    
     def create_investment_analysis(self):
         """Analyse des investissements"""
         st.markdown('<h3 class="section-header">💼 INVESTISSEMENTS ET DÉVELOPPEMENT</h3>', 
@@ -605,152 +864,88 @@ class MauritiusDashboard:
         
         tab1, tab2, tab3 = st.tabs(["Projets d'Investissement", "Pays Investisseurs", "Secteurs Privilégiés"])
         
+        with tab2:
+            tous_pays = self.investment_sketches.values('pays_origine')
+            pays = st.multiselect("Pays investisseurs:", tous_pays, default=tous_pays)
+        
+        selection = None if not pays or set(pays) == set(tous_pays) else tuple(sorted(pays))
+        figures = self.session_cached('investment', (selection,),
+                                      lambda: self.figures.investment_figures(self.investment_tables(selection)),
+                                      ['investment_data'])
+        
         with tab1:
             col1, col2 = st.columns(2)
             
             with col1:
-                # Investissements par type
-                invest_par_type = self.investment_data.groupby('type_investissement').agg({
-                    'montant_usd_millions': 'sum',
-                    'emplois_crees': 'sum'
-                }).reset_index()
-                
-                fig = px.bar(invest_par_type, 
-                            x='type_investissement', 
-                            y='montant_usd_millions',
-                            title='Investissements par Type (Millions USD)',
-                            color='type_investissement',
-                            color_discrete_sequence=px.colors.qualitative.Set3)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['investissements_par_type'], use_container_width=True)
             
             with col2:
-                # Évolution temporelle des investissements
-                invest_temporel = self.investment_data.groupby(
-                    self.investment_data['date_approbation'].dt.year
-                )['montant_usd_millions'].sum().reset_index()
-                
-                fig = px.line(invest_temporel, 
-                             x='date_approbation', 
-                             y='montant_usd_millions',
-                             title='Évolution des Investissements Annuels',
-                             markers=True,
-                             color_discrete_sequence=['#1A206D'])
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['evolution_annuelle'], use_container_width=True)
         
         with tab2:
             col1, col2 = st.columns(2)
             
             with col1:
-                # Investissements par pays
-                invest_par_pays = self.investment_data.groupby('pays_origine').agg({
-                    'montant_usd_millions': 'sum',
-                    'emplois_crees': 'sum'
-                }).reset_index()
-                
-                fig = px.pie(invest_par_pays, 
-                            values='montant_usd_millions', 
-                            names='pays_origine',
-                            title='Répartition des Investissements par Pays d\'Origine')
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['repartition_pays'], use_container_width=True)
             
             with col2:
-                # Top 10 des plus gros investissements
-                top_investissements = self.investment_data.nlargest(10, 'montant_usd_millions')
-                fig = px.bar(top_investissements, 
-                            x='montant_usd_millions', 
-                            y='type_investissement',
-                            orientation='h',
-                            title='Top 10 des Plus Gros Investissements',
-                            color='pays_origine',
-                            color_discrete_sequence=px.colors.qualitative.Set3)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['top_investissements'], use_container_width=True)
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.plotly_chart(figures['distribution_montants'], use_container_width=True)
+            
+            with col2:
+                st.plotly_chart(figures['percentiles_emplois'], use_container_width=True)
         
         with tab3:
-            # Analyse par secteur d'investissement
-            invest_par_secteur = self.investment_data.groupby('secteur').agg({
-                'montant_usd_millions': ['sum', 'count'],
-                'emplois_crees': 'sum'
-            }).round(2)
-            invest_par_secteur.columns = ['montant_total', 'nombre_projets', 'emplois_total']
-            invest_par_secteur = invest_par_secteur.reset_index()
-            
             col1, col2 = st.columns(2)
             
             with col1:
-                fig = px.bar(invest_par_secteur, 
-                            x='secteur', 
-                            y='montant_total',
-                            title='Investissements par Secteur (Millions USD)',
-                            color='secteur',
-                            color_discrete_map={secteur: info['couleur'] for secteur, info in self.secteurs.items()})
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['investissements_secteur'], use_container_width=True)
             
             with col2:
-                fig = px.scatter(invest_par_secteur, 
-                               x='montant_total', 
-                               y='emplois_total',
-                               size='nombre_projets',
-                               color='secteur',
-                               title='Relation Investissements vs Emplois Créés',
-                               hover_name='secteur',
-                               size_max=40,
-                               color_discrete_map={secteur: info['couleur'] for secteur, info in self.secteurs.items()})
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['investissements_emplois'], use_container_width=True)
+    
+    def regional_tables(self):
+        """Données régionales simulées"""
+        return {'regions': self.reference.regions.reset_index()}
     
     def create_regional_analysis(self):
         """Analyse régionale et infrastructure"""
         st.markdown('<h3 class="section-header">🗺️ DÉVELOPPEMENT RÉGIONAL ET INFRASTRUCTURE</h3>', 
                    unsafe_allow_html=True)
         
-        # Données régionales simulées
-        regions_data = {
-            'Région': ['Port-Louis', 'Plaines Wilhems', 'Nord', 'Sud', 'Est', 'Ouest', 'Îles'],
-            'Population': [150000, 400000, 120000, 110000, 100000, 130000, 5000],
-            'PIB_Regional': [4.5, 6.2, 1.8, 1.5, 1.2, 2.1, 0.1],
-            'Taux_Chomage': [8.2, 7.1, 9.5, 10.2, 11.1, 8.8, 12.5],
-            'Investissements_Recents': [1200, 800, 350, 280, 320, 450, 50]
-        }
-        
-        df_regions = pd.DataFrame(regions_data)
-        
         tab1, tab2, tab3 = st.tabs(["Carte Économique", "Infrastructures", "Développement Régional"])
         
         with tab1:
             col1, col2 = st.columns(2)
             
             with col1:
-                # PIB par région
-                fig = px.bar(df_regions, 
-                            x='Région', 
-                            y='PIB_Regional',
-                            title='PIB par Région (Milliards USD)',
-                            color='Région',
-                            color_discrete_sequence=px.colors.qualitative.Set3)
-                st.plotly_chart(fig, use_container_width=True)
+                indicateur = st.selectbox("Indicateur:", ['PIB_Regional', 'Taux_Chomage', 'Population', 'Investissements_Recents'],
+                                          format_func=lambda colonne: colonne.replace('_', ' '))
             
             with col2:
-                # Chômage par région
-                fig = px.bar(df_regions, 
-                            x='Région', 
-                            y='Taux_Chomage',
-                            title='Taux de Chômage par Région (%)',
-                            color='Taux_Chomage',
-                            color_continuous_scale='Reds')
-                st.plotly_chart(fig, use_container_width=True)
+                vue = st.selectbox("Zoom sur:", ['Île Maurice'] + list(self.reference.regions.index))
+            
+            figures = self.session_cached('regional', (indicateur, vue),
+                                          lambda: self.figures.regional_figures(self.regional_tables(), indicateur, vue))
+            st.plotly_chart(figures['carte_regionale'], use_container_width=True)
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.plotly_chart(figures['pib_regional'], use_container_width=True)
+            
+            with col2:
+                st.plotly_chart(figures['chomage_regional'], use_container_width=True)
         
         with tab2:
             st.subheader("Infrastructures Clés de l'Île Maurice")
             
-            infrastructures = [
-                {'Nom': 'Port Louis Harbour', 'Type': 'Port', 'Capacité': 'Container 600k/an', 'Région': 'Port-Louis'},
-                {'Nom': 'Aéroport SSR', 'Type': 'Aéroport', 'Capacité': '4M passagers/an', 'Région': 'Plaines Wilhems'},
-                {'Nom': 'Metro Express', 'Type': 'Transport', 'Capacité': '60k passagers/jour', 'Région': 'Plaines Wilhems'},
-                {'Nom': 'Bagatelle Dam', 'Type': 'Eau', 'Capacité': '14Mm³', 'Région': 'Plaines Wilhems'},
-                {'Nom': 'CT Power', 'Type': 'Énergie', 'Capacité': '110 MW', 'Région': 'Port-Louis'},
-            ]
-            
-            for infra in infrastructures:
-                with st.expander(f"🏗️ {infra['Nom']} - {infra['Type']}"):
+            for nom, infra in self.reference.infrastructures.iterrows():
+                with st.expander(f"🏗️ {nom} - {infra['Type']}"):
                     st.write(f"**Région:** {infra['Région']}")
                     st.write(f"**Capacité:** {infra['Capacité']}")
                     st.write(f"**Statut:** {random.choice(['Opérationnel', 'En expansion', 'En maintenance'])}")
@@ -758,17 +953,10 @@ class MauritiusDashboard:
         with tab3:
             st.subheader("Projets de Développement Régional")
             
-            projets = [
-                {'Nom': 'Smart City Île Maurice', 'Région': 'Multiple', 'Budget': '2.5 Md USD', 'Échéance': '2030'},
-                {'Nom': 'Port Louis Waterfront', 'Région': 'Port-Louis', 'Budget': '500 M USD', 'Échéance': '2025'},
-                {'Nom': 'Côte d\'Or Sport City', 'Région': 'Plaines Wilhems', 'Budget': '300 M USD', 'Échéance': '2024'},
-                {'Nom': 'Rivière Noire Resort', 'Région': 'Ouest', 'Budget': '200 M USD', 'Échéance': '2026'},
-            ]
-            
-            for projet in projets:
+            for nom, projet in self.reference.projets.iterrows():
                 col1, col2, col3 = st.columns([3, 2, 1])
                 with col1:
-                    st.write(f"**{projet['Nom']}**")
+                    st.write(f"**{nom}**")
                     st.write(f"Région: {projet['Région']}")
                 with col2:
                     st.write(f"Budget: {projet['Budget']}")
@@ -777,6 +965,24 @@ class MauritiusDashboard:
                     st.write(f"Progression: {progress}%")
                     st.progress(progress)
     
+    def export_tables(self, date_debut, date_fin):
+        """Instantané des tables de chaque vue pour les exports statiques, pris entre deux mises à jour"""
+        produit_export = self.reference.produits_commerce.index[0]
+        marche = self.reference.marches_touristiques.index[0]
+        
+        with self._verrou:
+            return {
+                'economie': {
+                    'vue': self.overview_tables(date_debut, date_fin),
+                    'commerce': self.trade_detail_tables('export', produit_export, date_debut, date_fin),
+                    'tourisme': self.tourism_market_tables(marche, date_debut, date_fin),
+                    'correlations': self.correlation_tables()
+                },
+                'secteurs': {'vue': self.sectors_tables()},
+                'investissements': {'vue': self.investment_tables()},
+                'regions': {'vue': self.regional_tables()}
+            }
+    
     def create_sidebar(self):
         """Crée la sidebar avec les contrôles"""
         st.sidebar.markdown("## 🎛️ CONTRÔLES D'ANALYSE")
@@ -787,6 +993,9 @@ class MauritiusDashboard:
                                          value=datetime(2020, 1, 1))
         date_fin = st.sidebar.date_input("Date de fin", 
                                        value=datetime.now())
+        if date_debut > date_fin:
+            st.sidebar.warning("Date de début postérieure à la date de fin : les deux dates ont été inversées")
+            date_debut, date_fin = date_fin, date_debut
         
         # Filtres secteurs
         st.sidebar.markdown("### 🏢 Filtres sectoriels")
@@ -803,9 +1012,36 @@ class MauritiusDashboard:
         
         # Bouton de rafraîchissement manuel
         if st.sidebar.button("🔄 Rafraîchir les données"):
-            self.update_live_data()
             st.rerun()
         
+        # Export statique en arrière-plan
+        if st.sidebar.button("📤 Exporter un instantané"):
+            st.session_state['export_en_cours'] = get_export_pipeline().submit(self, date_debut, date_fin)
+        
+        export_en_cours = st.session_state.get('export_en_cours')
+        if export_en_cours is not None:
+            if not export_en_cours.done():
+                st.sidebar.info("⏳ Export en cours...")
+            elif export_en_cours.exception() is not None:
+                st.sidebar.error(f"Échec de l'export: {export_en_cours.exception()}")
+            else:
+                st.sidebar.success(f"✅ Export disponible: {export_en_cours.result()}")
+        
+        # Qualité des données
+        synthese = self.quality.summary()
+        with st.sidebar.expander(f"🩺 Qualité des données ({synthese['anomalies'].sum()} anomalies)"):
+            st.dataframe(synthese, use_container_width=True, hide_index=True)
+        
+        # Mémoire des sessions
+        usage = get_session_manager().usage(current_session_id())
+        session = usage['sessions'][current_session_id()] or {'octets': 0, 'entrees': 0}
+        with st.sidebar.expander("💾 Mémoire des sessions"):
+            st.metric("Cette session", f"{session['octets'] / 1024 ** 2:.1f} Mo",
+                      f"{session['entrees']} résultats en cache", delta_color="off")
+            st.progress(min(session['octets'] / usage['budget_session'], 1.0))
+            st.caption(f"Total : {usage['octets'] / 1024 ** 2:.1f} / {usage['budget_global'] / 1024 ** 2:.0f} Mo "
+                       f"sur {usage['nb_sessions']} session(s) — {usage['evictions']} évictions")
+        
         # Informations Île Maurice
         st.sidebar.markdown("---")
         st.sidebar.markdown("### 🇲🇺 ÎLE MAURICE")
@@ -820,17 +1056,10 @@ class MauritiusDashboard:
         
         # Indicateurs régionaux
         st.sidebar.markdown("### 🌍 COMPARAISON RÉGIONALE")
-        indicateurs_region = {
-            'Maurice': {'PIB/hab': 11200, 'Croissance': 7.8, 'Inflation': 4.2},
-            'Réunion': {'PIB/hab': 25800, 'Croissance': 3.2, 'Inflation': 2.8},
-            'Madagascar': {'PIB/hab': 520, 'Croissance': 4.4, 'Inflation': 8.6},
-            'Seychelles': {'PIB/hab': 15600, 'Croissance': 8.8, 'Inflation': 3.1}
-        }
-        
-        for pays, data in indicateurs_region.items():
+        for pays, data in self.reference.comparaison_regionale.iterrows():
             st.sidebar.metric(
                 pays,
-                f"{data['PIB/hab']:,} USD/hab",
+                f"{data['PIB/hab']:,.0f} USD/hab",
                 f"{data['Croissance']}% croissance"
             )
         
@@ -844,8 +1073,8 @@ class MauritiusDashboard:
 
     def run_dashboard(self):
         """Exécute le dashboard complet"""
-        # Mise à jour des données live
-        self.update_live_data()
+        # Données partagées : nouvelle version publiée depuis le dernier rerun ?
+        self.refresh_shared_data()
         
         # Sidebar
         controls = self.create_sidebar()
@@ -867,7 +1096,7 @@ class MauritiusDashboard:
         ])
         
         with tab1:
-            self.create_economic_overview()
+            self.create_economic_overview(controls)
         
         with tab2:
             self.create_sectors_analysis()
@@ -972,7 +1201,60 @@ class MauritiusDashboard:
             time.sleep(30)  # Rafraîchissement toutes les 30 secondes
             st.rerun()
 
+@st.cache_resource
+def get_dashboard():
+    """Instance conservée entre les reruns : les niveaux agrégés ne sont calculés qu'une fois"""
+    return MauritiusDashboard(os.environ.get('MAURICE_SHARED_DATA'))
+
+@st.cache_resource
+def get_live_feed():
+    """Consommateur du flux live, unique par processus et alimentant le dashboard partagé
+
+    Source définie par MAURICE_LIVE_FEED (tcp://hôte:port ou chemin de fichier) ;
+    à défaut, le publieur local de simulation est démarré.
+    """
+    source = os.environ.get('MAURICE_LIVE_FEED')
+    if not source:
+        source = LocalPublisher(intervalle=2.0).start().url
+    return LiveFeedConsumer(get_dashboard().ingest, source).start()
+
+def current_session_id():
+    """Identifiant de la session Streamlit en cours ('local' hors d'une exécution Streamlit)"""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else 'local'
+
+@st.cache_resource
+def get_session_manager():
+    """Gestionnaire d'état par session partagé par le processus
+
+    Budgets en Mo via MAURICE_BUDGET_SESSION_MO et MAURICE_BUDGET_GLOBAL_MO,
+    expiration des sessions inactives via MAURICE_SESSION_INACTIVITE (secondes).
+    """
+    return SessionStateManager(
+        budget_session=float(os.environ.get('MAURICE_BUDGET_SESSION_MO', 64)) * 1024 ** 2,
+        budget_global=float(os.environ.get('MAURICE_BUDGET_GLOBAL_MO', 512)) * 1024 ** 2,
+        inactivite_max=float(os.environ.get('MAURICE_SESSION_INACTIVITE', 1800))
+    )
+
+@st.cache_resource
+def get_export_pipeline():
+    """Pool d'export partagé par toutes les sessions"""
+    return ExportPipeline('exports')
+
+@st.cache_resource
+def get_query_api(port):
+    """API JSON servie depuis le processus Streamlit, sur les mêmes données en cache"""
+    api = DashboardQueryAPI(get_dashboard())
+    serve(api, port=port)
+    return api
+
 # Lancement du dashboard
 if __name__ == "__main__":
-    dashboard = MauritiusDashboard()
+    configure_page()
+    dashboard = get_dashboard()
+    if dashboard.donnees_partagees is None:
+        get_live_feed()  # Sinon, le flux est consommé par le processus publieur
+    if os.environ.get('MAURICE_API_PORT'):
+        get_query_api(int(os.environ['MAURICE_API_PORT']))
     dashboard.run_dashboard()
\ No newline at end of file
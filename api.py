@@ -0,0 +1,235 @@
+# api.py
+import argparse
+import hashlib
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from resampling import NIVEAUX
+
+# Dimensions de regroupement autorisées pour chaque jeu de données
+DIMENSIONS = {
+    'economic_data': [],
+    'tourism_data': ['principaux_marches'],
+    'tourism_markets': [],
+    'trade_data': ['principal_produit_export', 'principal_produit_import', 'principal_partenaire'],
+    'investment_data': ['type_investissement', 'pays_origine', 'secteur', 'statut']
+}
+
+
+class RessourceInconnue(Exception):
+    """Route ou jeu de données inexistant (404) ; les autres erreurs de requête donnent un 400"""
+
+
+class DashboardQueryAPI:
+    """Couche de requêtes sur les jeux de données partagés du dashboard
+
+    Utilisable directement en Python ou via `serve` en HTTP/JSON. Chaque
+    réponse porte un ETag dérivé de la version des données et de la requête :
+    un client qui renvoie `If-None-Match` obtient un 304 sans recalcul.
+    """
+
+    def __init__(self, dashboard, taille_cache=256):
+        self.dashboard = dashboard
+        self._instance = uuid.uuid4().hex[:8]  # Invalide les ETags après un redémarrage
+        self._cache = OrderedDict()
+        self._taille_cache = taille_cache
+        self._verrou = threading.Lock()
+
+    def datasets(self):
+        """Jeux de données disponibles, avec leurs colonnes et leur version"""
+        return {
+            nom: {
+                'colonnes': list(getattr(self.dashboard, nom).columns),
+                'dimensions': DIMENSIONS[nom],
+                'version': self.dashboard.resampler.versions[nom]
+            }
+            for nom in DIMENSIONS
+        }
+
+    def series(self, dataset, colonnes=None, debut=None, fin=None, niveau=None):
+        """Tranche temporelle d'un jeu de données, au niveau demandé ou adapté à la période"""
+        self._verifier(dataset)
+        resampler = self.dashboard.resampler
+
+        if debut is None and fin is None:
+            niveau = niveau or 'M'
+            data = resampler.level(dataset, niveau)
+        else:
+            dates = resampler.level(dataset, 'M').iloc[:, 0]
+            data, niveau = resampler.slice(dataset, debut or dates.min(), fin or dates.max(), niveau)
+        return self._colonnes(data, colonnes), niveau
+
+    def rollup(self, dataset, niveau='Y', par=None, colonnes=None):
+        """Agrégat temporel (mois, trimestre, année) ou par dimension (pays, secteur...)"""
+        self._verifier(dataset)
+
+        if par is None:
+            return self._colonnes(self.dashboard.resampler.level(dataset, niveau), colonnes)
+
+        if par not in DIMENSIONS[dataset]:
+            raise ValueError(f"Dimension inconnue pour {dataset}: {par}")
+        data = getattr(self.dashboard, dataset)
+        agrege = data.groupby(par).sum(numeric_only=True)
+        agrege.insert(0, 'nombre', data.groupby(par).size())
+        return self._colonnes(agrege.reset_index(), colonnes, garder=[par, 'nombre'])
+
+    def deltas(self, dataset, colonnes=None, niveau='M'):
+        """Dernière valeur de chaque indicateur et variation vs la période précédente"""
+        self._verifier(dataset)
+        niveau_complet = self.dashboard.resampler.level(dataset, niveau, complets=True)
+        data = niveau_complet.select_dtypes('number')
+        if colonnes:
+            data = self._colonnes(data, colonnes, garder=[])
+
+        derniere, precedente = data.iloc[-1], data.iloc[-2]
+        periode = niveau_complet.iloc[-1, 0]
+        return {
+            'periode': periode.date().isoformat(),
+            'niveau': niveau,
+            'indicateurs': {
+                colonne: {
+                    'valeur': float(derniere[colonne]),
+                    'precedente': float(precedente[colonne]),
+                    'variation': float(derniere[colonne] - precedente[colonne]),
+                    'variation_pct': (float((derniere[colonne] / precedente[colonne] - 1) * 100)
+                                      if precedente[colonne] else None)
+                }
+                for colonne in data.columns
+            }
+        }
+
+    def etag(self, route, params):
+        """ETag d'une requête : version des données concernées + requête normalisée"""
+        versions = self.dashboard.resampler.versions
+        dataset = params.get('dataset')
+        version = versions.get(dataset) if dataset else sorted(versions.items())
+        cle = json.dumps([self._instance, version, route, sorted(params.items())], default=str)
+        return '"' + hashlib.sha1(cle.encode('utf-8')).hexdigest()[:16] + '"'
+
+    def query(self, route, params):
+        """Exécute une requête et retourne (ETag, corps JSON), avec mise en cache par ETag"""
+        etag = self.etag(route, params)
+        with self._verrou:
+            if etag in self._cache:
+                self._cache.move_to_end(etag)
+                return etag, self._cache[etag]
+
+        corps = json.dumps(self._executer(route, params), ensure_ascii=False, default=str).encode('utf-8')
+
+        with self._verrou:
+            self._cache[etag] = corps
+            while len(self._cache) > self._taille_cache:
+                self._cache.popitem(last=False)
+        return etag, corps
+
+    def _executer(self, route, params):
+        """Aiguille une route HTTP vers la méthode correspondante"""
+        colonnes = params['colonnes'].split(',') if params.get('colonnes') else None
+
+        if route == '/datasets':
+            return self.datasets()
+        if route == '/series':
+            data, niveau = self.series(params.get('dataset'), colonnes,
+                                       params.get('debut'), params.get('fin'), params.get('niveau'))
+            return {'dataset': params['dataset'], 'niveau': niveau, 'donnees': self._records(data)}
+        if route == '/rollup':
+            data = self.rollup(params.get('dataset'), params.get('niveau', 'Y'), params.get('par'), colonnes)
+            return {'dataset': params['dataset'], 'donnees': self._records(data)}
+        if route == '/deltas':
+            return self.deltas(params.get('dataset'), colonnes, params.get('niveau', 'M'))
+        raise RessourceInconnue(f"Route inconnue: {route}")
+
+    def _verifier(self, dataset):
+        """Valide le nom du jeu de données"""
+        if not dataset:
+            raise ValueError("Paramètre requis: dataset")
+        if dataset not in DIMENSIONS:
+            raise RessourceInconnue(f"Jeu de données inconnu: {dataset}")
+
+    def _colonnes(self, data, colonnes, garder=None):
+        """Restreint aux colonnes demandées, en conservant la date ou la dimension"""
+        if not colonnes:
+            return data
+        garder = [data.columns[0]] if garder is None else garder
+        inconnues = set(colonnes) - set(data.columns)
+        if inconnues:
+            raise ValueError(f"Colonnes inconnues: {', '.join(sorted(inconnues))}")
+        return data[garder + [c for c in colonnes if c not in garder]]
+
+    def _records(self, data):
+        """Lignes JSON avec dates ISO"""
+        return json.loads(data.to_json(orient='records', date_format='iso'))
+
+
+class _QueryHandler(BaseHTTPRequestHandler):
+    """Traduit les requêtes HTTP GET vers `DashboardQueryAPI.query`"""
+    api = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {cle: valeurs[-1] for cle, valeurs in parse_qs(url.query).items()}
+
+        if 'niveau' in params and params['niveau'] not in NIVEAUX:
+            return self._repondre(400, {'erreur': f"Niveau inconnu: {params['niveau']}"})
+
+        # Réponse conditionnelle : ETag calculé sans exécuter la requête
+        etag = self.api.etag(url.path, params)
+        if etag in [e.strip() for e in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        try:
+            etag, corps = self.api.query(url.path, params)
+        except RessourceInconnue as erreur:
+            return self._repondre(404, {'erreur': str(erreur)})
+        except (LookupError, ValueError, TypeError) as erreur:
+            return self._repondre(400, {'erreur': str(erreur)})
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corps)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def _repondre(self, statut, payload):
+        corps = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(statut)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corps)))
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(api, host='127.0.0.1', port=8765):
+    """Démarre le serveur HTTP/JSON dans un thread daemon et le retourne"""
+    handler = type('QueryHandler', (_QueryHandler,), {'api': api})
+    serveur = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=serveur.serve_forever, name='query-api', daemon=True).start()
+    return serveur
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API JSON locale sur les données du dashboard Île Maurice")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    from Dashboard import MauritiusDashboard
+
+    serveur = serve(DashboardQueryAPI(MauritiusDashboard()), args.host, args.port)
+    print(f"API disponible sur http://{args.host}:{args.port}/datasets")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        serveur.shutdown()
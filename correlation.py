@@ -0,0 +1,103 @@
+# correlation.py
+import numpy as np
+import pandas as pd
+
+
+class CrossCorrelationEngine:
+    """Corrélations croisées décalées entre tous les indicateurs, en un seul calcul matriciel
+
+    Pour un décalage k, la corrélation [i, j] relie l'indicateur i au mois t
+    à l'indicateur j au mois t + k : une valeur forte signifie que i précède j.
+    """
+
+    def __init__(self, max_lag=12):
+        self.max_lag = max_lag
+        self.version = None
+        self.colonnes = []
+        self._matrice = np.empty((0, 0))
+        self._produits = None   # Sommes Σ x[t] x[t+k]ᵀ pour chaque décalage k
+        self._somme = None
+
+    def sync(self, data, version):
+        """Met à jour les corrélations pour une nouvelle version des données alignées
+
+        Si les lignes déjà traitées sont inchangées, seuls les nouveaux mois sont
+        ajoutés aux sommes ; sinon (révision, nouvelles colonnes) tout est recalculé.
+        """
+        if version == self.version:
+            return
+
+        colonnes = list(data.columns)
+        matrice = data.to_numpy(dtype=float)
+        n = len(self._matrice)
+
+        if (colonnes == self.colonnes and 0 < n <= len(matrice)
+                and np.array_equal(matrice[:n], self._matrice)):
+            # Nouveaux mois cumulés dans des copies : l'état publié n'est jamais modifié en place
+            produits, somme = self._produits.copy(), self._somme.copy()
+            for fin in range(n + 1, len(matrice) + 1):
+                self._ajouter(produits, somme, matrice[:fin])
+        else:
+            produits, somme = self._calculer(matrice)
+
+        self.colonnes, self._matrice, self._produits, self._somme = colonnes, matrice, produits, somme
+        self.version = version
+
+    def correlation(self, lag=0):
+        """Matrice de corrélation pour un décalage donné (en mois)"""
+        return pd.DataFrame(self._correlations()[lag], index=self.colonnes, columns=self.colonnes)
+
+    def strongest(self):
+        """Corrélation la plus forte en valeur absolue sur tous les décalages, et le décalage associé"""
+        correlations = self._correlations()
+        meilleur = np.abs(correlations).argmax(axis=0)
+        valeurs = np.take_along_axis(correlations, meilleur[None], axis=0)[0]
+
+        return (pd.DataFrame(valeurs, index=self.colonnes, columns=self.colonnes),
+                pd.DataFrame(meilleur, index=self.colonnes, columns=self.colonnes))
+
+    def _calculer(self, matrice):
+        """Calcul complet des produits décalés par FFT, pour toutes les paires à la fois"""
+        nb_lignes = len(matrice)
+        nb_lags = min(self.max_lag, max(nb_lignes - 1, 0)) + 1
+        taille_fft = 1 << int(np.ceil(np.log2(max(2 * nb_lignes, 2))))
+
+        spectre = np.fft.rfft(matrice, n=taille_fft, axis=0)
+        croise = np.conj(spectre)[:, :, None] * spectre[:, None, :]
+        produits = np.fft.irfft(croise, n=taille_fft, axis=0)[:nb_lags]
+
+        tous = np.zeros((self.max_lag + 1, matrice.shape[1], matrice.shape[1]))
+        tous[:nb_lags] = produits
+        return tous, matrice.sum(axis=0)
+
+    def _ajouter(self, produits, somme, matrice):
+        """Ajoute aux sommes le dernier mois de `matrice` : O(max_lag × n²) au lieu d'un recalcul complet"""
+        ligne = matrice[-1]
+        nb_lags = min(self.max_lag + 1, len(matrice))
+
+        # Lignes t, t-1, ..., t-k appariées avec la nouvelle ligne
+        precedentes = matrice[::-1][:nb_lags]
+        produits[:nb_lags] += precedentes[:, :, None] * ligne[None, None, :]
+        somme += ligne
+
+    def _correlations(self):
+        """Corrélations (K+1, n, n) à partir des sommes de produits et des moyennes globales"""
+        matrice = self._matrice
+        nb_lignes = len(matrice)
+        nb_lags = min(self.max_lag, max(nb_lignes - 1, 0)) + 1
+        lags = np.arange(nb_lags)
+        moyenne = self._somme / nb_lignes
+
+        # Sommes des premières et dernières lignes exclues à chaque décalage
+        tete = np.vstack([np.zeros(matrice.shape[1]), np.cumsum(matrice[:nb_lags - 1], axis=0)])
+        queue = np.vstack([np.zeros(matrice.shape[1]), np.cumsum(matrice[::-1][:nb_lags - 1], axis=0)])
+        debut = self._somme - queue     # Σ x[t] pour t < T - k
+        fin = self._somme - tete        # Σ x[t] pour t >= k
+
+        covariance = (self._produits[:nb_lags]
+                      - debut[:, :, None] * moyenne[None, None, :]
+                      - moyenne[None, :, None] * fin[:, None, :]
+                      + (nb_lignes - lags)[:, None, None] * np.outer(moyenne, moyenne)[None]) / nb_lignes
+
+        ecart_type = np.sqrt(np.clip(np.diag(covariance[0]), 1e-12, None))
+        return np.clip(covariance / np.outer(ecart_type, ecart_type)[None], -1.0, 1.0)
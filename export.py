@@ -0,0 +1,246 @@
+# export.py
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from importlib.util import find_spec
+from multiprocessing import get_context
+
+import pandas as pd
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from figures import DashboardFigures
+from reference import get_reference_data
+
+# Titres des pages HTML exportées
+TITRES_VUES = {
+    'economie': "Vue d'Ensemble Économique",
+    'secteurs': 'Analyse par Secteur',
+    'investissements': 'Investissements et Développement',
+    'regions': 'Développement Régional'
+}
+
+
+def _abaisser_priorite():
+    """Les workers d'export passent après les sessions interactives"""
+    try:
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+
+
+def _construire_figures(instantane):
+    """Construit les figures de chaque vue à partir des tables (exécuté dans un processus du pool)"""
+    vues = DashboardFigures(get_reference_data()).export_figures(instantane)
+    return {vue: {nom: fig.to_json() for nom, fig in figures.items()} for vue, figures in vues.items()}
+
+
+def _rendre_figure(fig_json, dossier_cache, empreinte, formats):
+    """Rend une figure dans le cache (exécuté dans un processus du pool)"""
+    fig = pio.from_json(fig_json)
+    resultats = {}
+
+    if 'html' in formats:
+        chemin = os.path.join(dossier_cache, f"{empreinte}.html")
+        with open(chemin, 'w', encoding='utf-8') as fichier:
+            fichier.write(fig.to_html(full_html=False, include_plotlyjs=False))
+        resultats['html'] = chemin
+
+    if 'png' in formats:
+        chemin = os.path.join(dossier_cache, f"{empreinte}.png")
+        try:
+            fig.write_image(chemin, width=1200, height=700)
+            resultats['png'] = chemin
+        except Exception as erreur:  # Moteur de rendu (kaleido) absent ou défaillant
+            resultats['png_erreur'] = str(erreur)
+
+    return resultats
+
+
+class ExportPipeline:
+    """Exporte des instantanés statiques (HTML, PNG, CSV) des vues du dashboard
+
+    Un thread coordinateur prend un instantané des tables entre deux mises à
+    jour ; la construction des figures et leur rendu se font dans un pool de
+    processus de faible priorité, hors du processus Streamlit : l'appel à
+    `submit` rend la main immédiatement. Les figures identiques à un export
+    précédent sont reprises du cache au lieu d'être rendues à nouveau ; le
+    cache est borné en taille et en âge, les rendus les moins récemment
+    utilisés étant supprimés en premier.
+    """
+
+    def __init__(self, dossier='exports', max_workers=2, formats=('html', 'png', 'csv'),
+                 taille_cache_max=200 * 1024 ** 2, age_cache_max=30 * 86400):
+        self.dossier = dossier
+        self.dossier_cache = os.path.join(dossier, '_cache')
+        self.taille_cache_max = taille_cache_max
+        self.age_cache_max = age_cache_max
+        self.formats = tuple(formats)
+        if 'png' in self.formats and find_spec('kaleido') is None:
+            # Export PNG optionnel : nécessite `pip install kaleido`
+            self.formats = tuple(f for f in self.formats if f != 'png')
+
+        os.makedirs(self.dossier_cache, exist_ok=True)
+        self._coordinateur = ThreadPoolExecutor(max_workers=1, thread_name_prefix='export')
+        self._workers = ProcessPoolExecutor(max_workers=max_workers,
+                                            mp_context=get_context('spawn'),
+                                            initializer=_abaisser_priorite)
+
+    def submit(self, dashboard, date_debut, date_fin):
+        """Lance un export en arrière-plan et retourne un Future vers son dossier"""
+        return self._coordinateur.submit(self._exporter, dashboard, date_debut, date_fin)
+
+    def shutdown(self):
+        """Arrête le coordinateur et le pool de rendu"""
+        self._coordinateur.shutdown(wait=True)
+        self._workers.shutdown(wait=True)
+
+    def _exporter(self, dashboard, date_debut, date_fin):
+        """Collecte les vues, rend les figures manquantes et assemble l'instantané"""
+        instantane = dashboard.export_tables(date_debut, date_fin)
+        tables_vues = {vue: tables['vue'] for vue, tables in instantane.items()}
+        vues = self._workers.submit(_construire_figures, instantane).result()
+        dossier_export = os.path.join(self.dossier, datetime.now().strftime('%Y-%m-%d_%H%M%S'))
+        os.makedirs(dossier_export, exist_ok=True)
+
+        # Empreinte de chaque figure : seules les nouvelles sont rendues
+        rendus = {}
+        empreintes_figures = {}
+        for vue, figures in vues.items():
+            for nom, fig_json in figures.items():
+                empreinte = hashlib.sha256(fig_json.encode('utf-8')).hexdigest()[:20]
+                empreintes_figures[(vue, nom)] = empreinte
+                if empreinte in rendus:
+                    continue
+                if self._en_cache(empreinte):
+                    self._marquer_utilise(empreinte)
+                else:
+                    rendus[empreinte] = self._workers.submit(
+                        _rendre_figure, fig_json, self.dossier_cache, empreinte, self.formats)
+
+        erreurs = {}
+        for empreinte, future in rendus.items():
+            resultat = future.result()
+            if 'png_erreur' in resultat:
+                erreurs[empreinte] = resultat['png_erreur']
+
+        manifeste = {
+            'date_export': datetime.now().isoformat(timespec='seconds'),
+            'periode': [str(date_debut), str(date_fin)],
+            'figures_rendues': len(rendus),
+            'figures_en_cache': len(set(empreintes_figures.values())) - len(rendus),
+            'vues': {}
+        }
+
+        for vue, figures in vues.items():
+            empreintes = {nom: empreintes_figures[(vue, nom)] for nom in figures}
+            if 'html' in self.formats:
+                self._ecrire_page(dossier_export, vue, empreintes)
+            if 'png' in self.formats:
+                self._copier_images(dossier_export, vue, empreintes, erreurs)
+            manifeste['vues'][vue] = {'figures': empreintes, 'tables': list(tables_vues[vue])}
+
+        if 'csv' in self.formats:
+            self._ecrire_csv(dossier_export, tables_vues)
+
+        with open(os.path.join(dossier_export, 'manifest.json'), 'w', encoding='utf-8') as fichier:
+            json.dump(manifeste, fichier, ensure_ascii=False, indent=2)
+
+        self._nettoyer_cache(set(empreintes_figures.values()))
+        return dossier_export
+
+    def _en_cache(self, empreinte):
+        """Vérifie que tous les formats demandés existent déjà pour cette figure"""
+        extensions = [f for f in self.formats if f in ('html', 'png')]
+        return all(os.path.exists(os.path.join(self.dossier_cache, f"{empreinte}.{ext}"))
+                   for ext in extensions)
+
+    def _marquer_utilise(self, empreinte):
+        """Date de modification remise à maintenant : le rendu repris compte comme récent"""
+        for extension in ('html', 'png'):
+            try:
+                os.utime(os.path.join(self.dossier_cache, f"{empreinte}.{extension}"))
+            except FileNotFoundError:
+                pass
+
+    def _nettoyer_cache(self, conservees):
+        """Supprime les rendus trop anciens, puis les moins récents au-delà de la taille maximale
+
+        Les figures de l'export en cours (`conservees`) ne sont jamais supprimées.
+        """
+        fichiers = []
+        taille = 0
+        for entree in os.scandir(self.dossier_cache):
+            if entree.is_file():
+                etat = entree.stat()
+                taille += etat.st_size
+                if os.path.splitext(entree.name)[0] not in conservees:
+                    fichiers.append((etat.st_mtime, etat.st_size, entree.path))
+
+        limite_age = datetime.now().timestamp() - self.age_cache_max
+        for date_modification, taille_fichier, chemin in sorted(fichiers):
+            if date_modification >= limite_age and taille <= self.taille_cache_max:
+                break
+            try:
+                os.remove(chemin)
+            except FileNotFoundError:
+                pass
+            taille -= taille_fichier
+
+    def _ecrire_page(self, dossier_export, vue, empreintes):
+        """Assemble une page HTML autonome (plotly.js inclus une seule fois)"""
+        fragments = []
+        for empreinte in empreintes.values():
+            with open(os.path.join(self.dossier_cache, f"{empreinte}.html"), encoding='utf-8') as fichier:
+                fragments.append(fichier.read())
+
+        titre = TITRES_VUES.get(vue, vue)
+        page = (
+            '<!DOCTYPE html>\n<html><head><meta charset="utf-8">'
+            f'<title>{titre} - Île Maurice</title>'
+            f'<script type="text/javascript">{get_plotlyjs()}</script></head>\n'
+            f'<body><h1>🏝️ {titre}</h1>\n' + '\n'.join(fragments) + '\n</body></html>'
+        )
+        with open(os.path.join(dossier_export, f"{vue}.html"), 'w', encoding='utf-8') as fichier:
+            fichier.write(page)
+
+    def _copier_images(self, dossier_export, vue, empreintes, erreurs):
+        """Copie les PNG rendus depuis le cache"""
+        dossier_png = os.path.join(dossier_export, 'png')
+        os.makedirs(dossier_png, exist_ok=True)
+        for nom, empreinte in empreintes.items():
+            source = os.path.join(self.dossier_cache, f"{empreinte}.png")
+            if empreinte not in erreurs and os.path.exists(source):
+                shutil.copyfile(source, os.path.join(dossier_png, f"{vue}__{nom}.png"))
+
+    def _ecrire_csv(self, dossier_export, tables_vues):
+        """Regroupe les tables de toutes les vues dans une archive CSV"""
+        with zipfile.ZipFile(os.path.join(dossier_export, 'donnees.zip'), 'w', zipfile.ZIP_DEFLATED) as archive:
+            for vue, tables in tables_vues.items():
+                for nom, table in tables.items():
+                    tampon = io.StringIO()
+                    table.to_csv(tampon, index=not isinstance(table.index, pd.RangeIndex))
+                    archive.writestr(f"{vue}/{nom}.csv", tampon.getvalue())
+
+
+if __name__ == "__main__":
+    # Instantané hebdomadaire, par exemple depuis une tâche cron
+    parser = argparse.ArgumentParser(description="Export statique du dashboard Île Maurice")
+    parser.add_argument('--dossier', default='exports')
+    parser.add_argument('--debut', default='2020-01-01')
+    parser.add_argument('--fin', default=datetime.now().strftime('%Y-%m-%d'))
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--cache-mo', type=float, default=200, help="Taille maximale du cache de rendus (Mo)")
+    args = parser.parse_args()
+
+    from Dashboard import MauritiusDashboard
+
+    pipeline = ExportPipeline(args.dossier, max_workers=args.workers, taille_cache_max=args.cache_mo * 1024 ** 2)
+    print(pipeline.submit(MauritiusDashboard(), args.debut, args.fin).result())
+    pipeline.shutdown()
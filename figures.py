@@ -0,0 +1,374 @@
+# figures.py
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from regional_map import get_regional_geometry, ECHELLE_LONGITUDE, TOLERANCES
+
+
+class DashboardFigures:
+    """Construit les figures des vues à partir de leurs tables et du registre de référence
+
+    Aucun accès aux jeux de données : utilisé par les vues Streamlit comme par
+    les processus d'export, qui ne disposent que d'un instantané des tables.
+    """
+
+    def __init__(self, reference):
+        self.reference = reference
+    
+    def overview_figures(self, tables):
+        """Graphiques de la vue d'ensemble économique"""
+        economic = tables['economie']
+        trade = tables['commerce']
+        tourism = tables['tourisme']
+        df_secteurs = tables['secteurs']
+        figures = {}
+        
+        # Évolution du PIB
+        fig = px.line(economic, 
+                     x='date', 
+                     y='croissance_pib',
+                     title='Évolution de la Croissance du PIB (%)',
+                     color_discrete_sequence=['#1A206D'])
+        fig.add_hline(y=0, line_dash="dash", line_color="red")
+        figures['croissance_pib'] = fig
+        
+        # Inflation et chômage
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        fig.add_trace(
+            go.Scatter(x=economic['date'], y=economic['inflation'],
+                      name="Inflation", line=dict(color='#EA2839')),
+            secondary_y=False,
+        )
+        fig.add_trace(
+            go.Scatter(x=economic['date'], y=economic['taux_chomage'],
+                      name="Chômage", line=dict(color='#FFD100')),
+            secondary_y=True,
+        )
+        fig.update_layout(title_text="Inflation et Taux de Chômage")
+        fig.update_yaxes(title_text="Inflation (%)", secondary_y=False)
+        fig.update_yaxes(title_text="Chômage (%)", secondary_y=True)
+        figures['inflation_chomage'] = fig
+        
+        # Répartition du PIB par secteur
+        figures['repartition_pib'] = px.pie(df_secteurs, 
+                                            values='poids_pib', 
+                                            names='secteur',
+                                            title='Répartition du PIB par Secteur (%)',
+                                            color='secteur',
+                                            color_discrete_map=self.reference.couleurs_secteurs)
+        
+        # Croissance par secteur
+        fig = px.bar(df_secteurs, 
+                    x='secteur', 
+                    y='croissance',
+                    title='Taux de Croissance par Secteur (%)',
+                    color='secteur',
+                    color_discrete_map=self.reference.couleurs_secteurs)
+        fig.add_hline(y=0, line_dash="dash", line_color="red")
+        figures['croissance_secteurs'] = fig
+        
+        # Évolution du commerce extérieur
+        figures['commerce_exterieur'] = px.line(trade, 
+                                                x='date', 
+                                                y=['exportations', 'importations'],
+                                                title='Évolution des Exportations et Importations (Md USD)',
+                                                color_discrete_map={'exportations': '#28a745', 'importations': '#EA2839'})
+        
+        # Balance commerciale
+        fig = px.area(trade, 
+                     x='date', 
+                     y='balance_commerciale',
+                     title='Balance Commerciale (Md USD)',
+                     color_discrete_sequence=['#1A206D'])
+        fig.add_hline(y=0, line_dash="dash", line_color="red")
+        figures['balance_commerciale'] = fig
+        
+        # Arrivées touristiques
+        figures['arrivees_touristes'] = px.line(tourism, 
+                                                x='date', 
+                                                y='arrivees_touristes',
+                                                title='Évolution des Arrivées Touristiques',
+                                                color_discrete_sequence=['#FF6B00'])
+        
+        # Recettes touristiques
+        figures['recettes_tourisme'] = px.line(tourism, 
+                                               x='date', 
+                                               y='recettes_tourisme',
+                                               title='Évolution des Recettes Touristiques (Millions USD)',
+                                               color_discrete_sequence=['#FFD100'])
+        
+        return figures
+    
+    def correlation_figures(self, tables, decalage=0):
+        """Cartes de chaleur des corrélations entre indicateurs"""
+        figures = {}
+        
+        # Corrélation pour le décalage choisi
+        figures['correlations'] = px.imshow(tables['correlation'], 
+                                            title=f'Corrélations entre Indicateurs (décalage {decalage} mois)',
+                                            color_continuous_scale='RdBu_r',
+                                            zmin=-1, zmax=1,
+                                            text_auto='.2f',
+                                            aspect='auto')
+        
+        # Corrélation la plus forte tous décalages confondus
+        valeurs, meilleurs_decalages = tables['correlation_max'], tables['decalage_max']
+        fig = go.Figure(go.Heatmap(z=valeurs.values,
+                                   x=valeurs.columns,
+                                   y=valeurs.index,
+                                   text=meilleurs_decalages.values,
+                                   texttemplate='%{text}m',
+                                   hovertemplate='%{y} → %{x}<br>Corrélation: %{z:.2f}<br>Décalage: %{text} mois<extra></extra>',
+                                   colorscale='RdBu_r',
+                                   zmin=-1, zmax=1))
+        fig.update_layout(title_text='Corrélation Maximale et Décalage Associé (mois)')
+        figures['correlations_max'] = fig
+        
+        return figures
+    
+    def trade_detail_figures(self, tables, flux, produit):
+        """Principaux partenaires d'un produit et parts des échanges, sur la période"""
+        top_partenaires, parts = tables['top_partenaires'], tables['parts_partenaires']
+        libelle = 'Exportations' if flux == 'export' else 'Importations'
+        
+        fig = px.bar(top_partenaires, 
+                    x='partenaire', 
+                    y='valeur',
+                    title=f'Principaux Partenaires - {produit} (Md USD)',
+                    text=top_partenaires['part'].map('{:.1f}%'.format),
+                    color_discrete_sequence=['#1A206D'])
+        
+        return {
+            'top_partenaires': fig,
+            'parts_partenaires': px.pie(parts, 
+                                        values='valeur', 
+                                        names='partenaire',
+                                        title=f'Parts des {libelle} par Partenaire (%)',
+                                        color_discrete_sequence=px.colors.qualitative.Set3)
+        }
+    
+    def tourism_market_figures(self, tables, marche):
+        """Arrivées par marché et décomposition saisonnière du marché choisi"""
+        marches, composantes = tables['marches'], tables['composantes']
+        figures = {}
+        
+        # Format long (une série par marché) : reste valable sur une période sans données
+        arrivees = marches.melt(id_vars='date', value_vars=list(self.reference.marches_touristiques.index),
+                                var_name='marche', value_name='arrivees')
+        figures['arrivees_par_marche'] = px.area(arrivees, 
+                                                 x='date', 
+                                                 y='arrivees',
+                                                 color='marche',
+                                                 title='Arrivées Touristiques par Marché Émetteur',
+                                                 color_discrete_sequence=px.colors.qualitative.Set3)
+        
+        # Tendance
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=composantes['date'], y=composantes['observe'], 
+                                 name='Observé', line=dict(color='#c8c8c8')))
+        fig.add_trace(go.Scatter(x=composantes['date'], y=composantes['tendance'], 
+                                 name='Tendance', line=dict(color='#1A206D', width=3)))
+        fig.update_layout(title_text=f'Tendance des Arrivées - {marche}')
+        figures['tendance_marche'] = fig
+        
+        # Saisonnalité
+        fig = px.line(composantes, 
+                     x='date', 
+                     y='saisonnalite',
+                     title=f'Facteur Saisonnier - {marche}',
+                     color_discrete_sequence=['#FF6B00'])
+        fig.add_hline(y=1, line_dash="dash", line_color="gray")
+        figures['saisonnalite_marche'] = fig
+        
+        # Résidu, en écart à la tendance saisonnière
+        figures['residu_marche'] = px.bar(composantes.assign(ecart=(composantes['residu'] - 1) * 100), 
+                                          x='date', 
+                                          y='ecart',
+                                          title=f'Écart Résiduel (%) - {marche}',
+                                          labels={'ecart': 'residu'},
+                                          color_discrete_sequence=['#EA2839'])
+        
+        for nom, vide in [('arrivees_par_marche', marches.empty), ('tendance_marche', composantes.empty),
+                          ('saisonnalite_marche', composantes.empty), ('residu_marche', composantes.empty)]:
+            if vide:
+                figures[nom].add_annotation(text="Pas de données sur la période", xref='paper', yref='paper',
+                                            x=0.5, y=0.5, showarrow=False)
+        
+        return figures
+    
+    def sectors_figures(self, tables):
+        """Graphiques d'emploi par secteur"""
+        df_emploi = tables['emploi']
+        
+        return {
+            'emplois_par_secteur': px.bar(df_emploi, 
+                                          x='secteur', 
+                                          y='emplois',
+                                          title='Nombre d\'Emplois par Secteur',
+                                          color='secteur',
+                                          color_discrete_map=self.reference.couleurs_secteurs),
+            'repartition_emploi': px.pie(df_emploi, 
+                                         values='part_emploi_total', 
+                                         names='secteur',
+                                         title='Répartition de l\'Emploi par Secteur (%)',
+                                         color='secteur',
+                                         color_discrete_map=self.reference.couleurs_secteurs)
+        }
+    
+    def investment_figures(self, tables):
+        """Graphiques des investissements"""
+        distribution = tables['distribution_montants']
+        percentiles = tables['percentiles_emplois'].melt(
+            id_vars='pays_origine', value_vars=['q10', 'q25', 'q50', 'q75', 'q90'], var_name='percentile', value_name='emplois')
+        percentiles['percentile'] = percentiles['percentile'].str[1:].astype(int)
+        
+        return {
+            'investissements_par_type': px.bar(tables['par_type'], 
+                                               x='type_investissement', 
+                                               y='montant_usd_millions',
+                                               title='Investissements par Type (Millions USD)',
+                                               color='type_investissement',
+                                               color_discrete_sequence=px.colors.qualitative.Set3),
+            'evolution_annuelle': px.line(tables['annuel'], 
+                                          x='date_approbation', 
+                                          y='montant_usd_millions',
+                                          title='Évolution des Investissements Annuels',
+                                          markers=True,
+                                          color_discrete_sequence=['#1A206D']),
+            'repartition_pays': px.pie(tables['par_pays'], 
+                                       values='montant_usd_millions', 
+                                       names='pays_origine',
+                                       title='Répartition des Investissements par Pays d\'Origine'),
+            'top_investissements': px.bar(tables['top_investissements'], 
+                                          x='montant_usd_millions', 
+                                          y='type_investissement',
+                                          orientation='h',
+                                          title='Top 10 des Plus Gros Investissements',
+                                          color='pays_origine',
+                                          color_discrete_sequence=px.colors.qualitative.Set3),
+            # Boîtes à moustaches à partir des quantiles esquissés (min et max exacts)
+            'distribution_montants': go.Figure(go.Box(
+                x=distribution['pays_origine'], q1=distribution['q25'], median=distribution['q50'],
+                q3=distribution['q75'], lowerfence=distribution['min'], upperfence=distribution['max'],
+                marker_color='#1A206D', name='Montant'
+            )).update_layout(title='Distribution des Montants par Pays (Millions USD)', showlegend=False),
+            'percentiles_emplois': px.line(percentiles, 
+                                           x='percentile', 
+                                           y='emplois',
+                                           color='pays_origine',
+                                           title='Percentiles des Emplois Créés par Projet',
+                                           markers=True,
+                                           color_discrete_sequence=px.colors.qualitative.Set3),
+            'investissements_secteur': px.bar(tables['par_secteur'], 
+                                              x='secteur', 
+                                              y='montant_total',
+                                              title='Investissements par Secteur (Millions USD)',
+                                              color='secteur',
+                                              color_discrete_map=self.reference.couleurs_secteurs),
+            'investissements_emplois': px.scatter(tables['par_secteur'], 
+                                                  x='montant_total', 
+                                                  y='emplois_total',
+                                                  size='nombre_projets',
+                                                  color='secteur',
+                                                  title='Relation Investissements vs Emplois Créés',
+                                                  hover_name='secteur',
+                                                  size_max=40,
+                                                  color_discrete_map=self.reference.couleurs_secteurs)
+        }
+    
+    def regional_map_figure(self, df_regions, indicateur='PIB_Regional', vue='Île Maurice'):
+        """Carte choroplèthe hors ligne, au niveau de détail adapté à l'étendue affichée"""
+        geometrie = get_regional_geometry()
+        principales = [region for region in geometrie.regions if region != 'Îles']
+        emprise = geometrie.view(principales if vue == 'Île Maurice' else [vue])
+        tolerance = geometrie.level_for(max((emprise[2] - emprise[0]) * ECHELLE_LONGITUDE, emprise[3] - emprise[1]))
+        
+        valeurs = df_regions.set_index('Région')[indicateur]
+        echelle = 'Reds' if indicateur == 'Taux_Chomage' else 'Blues'
+        normalisees = (valeurs - valeurs.min()) / max(valeurs.max() - valeurs.min(), 1e-9)
+        couleurs = dict(zip(valeurs.index, px.colors.sample_colorscale(echelle, normalisees.tolist())))
+        
+        fig = go.Figure()
+        anneaux = dict(geometrie.rings(tolerance, emprise))
+        if vue == 'Île Maurice':
+            # Rodrigues en médaillon, au niveau le plus grossier
+            anneaux.update({('Îles', 'x2', 'y2'): geometrie.rings(TOLERANCES[0])['Îles']})
+        
+        for cle, polygones in anneaux.items():
+            region, axe_x, axe_y = cle if isinstance(cle, tuple) else (cle, 'x', 'y')
+            lon = np.concatenate([np.append(anneau[:, 0], np.nan) for anneau in polygones])
+            lat = np.concatenate([np.append(anneau[:, 1], np.nan) for anneau in polygones])
+            fig.add_trace(go.Scatter(
+                x=lon, y=lat, xaxis=axe_x, yaxis=axe_y, mode='lines', fill='toself',
+                fillcolor=couleurs[region], line=dict(color='white', width=1), hoveron='fills',
+                name=region, text=f"{region}<br>{indicateur}: {valeurs[region]:,.1f}", hoverinfo='text', showlegend=False
+            ))
+            fig.add_trace(go.Scatter(
+                x=[np.nanmean(lon)], y=[np.nanmean(lat)], xaxis=axe_x, yaxis=axe_y, mode='text',
+                text=[region], textfont=dict(size=10), hoverinfo='skip', showlegend=False
+            ))
+        
+        # Échelle de couleurs
+        fig.add_trace(go.Scatter(
+            x=[None], y=[None], mode='markers', hoverinfo='skip', showlegend=False,
+            marker=dict(colorscale=echelle, cmin=valeurs.min(), cmax=valeurs.max(), showscale=True,
+                        colorbar=dict(title=indicateur))
+        ))
+        
+        axe_masque = dict(visible=False, showgrid=False)
+        fig.update_layout(
+            title=f"{indicateur.replace('_', ' ')} par Région",
+            xaxis=dict(range=[emprise[0], emprise[2]], domain=[0, 1], **axe_masque),
+            yaxis=dict(range=[emprise[1], emprise[3]], scaleanchor='x', scaleratio=1 / ECHELLE_LONGITUDE, **axe_masque),
+            plot_bgcolor='#E8F4FA',
+            height=550,
+            margin=dict(l=10, r=10, t=50, b=10)
+        )
+        if vue == 'Île Maurice':
+            boite = geometrie.bbox['Îles']
+            fig.update_layout(
+                xaxis2=dict(domain=[0.0, 0.22], range=[boite[0] - 0.02, boite[2] + 0.02], anchor='y2', **axe_masque),
+                yaxis2=dict(domain=[0.0, 0.22], range=[boite[1] - 0.02, boite[3] + 0.02], anchor='x2',
+                            scaleanchor='x2', scaleratio=1 / ECHELLE_LONGITUDE, **axe_masque),
+                annotations=[dict(text="Rodrigues", x=0.11, y=0.23, xref='paper', yref='paper', showarrow=False)]
+            )
+        
+        return fig
+    
+    def regional_figures(self, tables, indicateur='PIB_Regional', vue='Île Maurice'):
+        """Graphiques régionaux"""
+        df_regions = tables['regions']
+        
+        return {
+            # Carte choroplèthe
+            'carte_regionale': self.regional_map_figure(df_regions, indicateur, vue),
+            # PIB par région
+            'pib_regional': px.bar(df_regions, 
+                                   x='Région', 
+                                   y='PIB_Regional',
+                                   title='PIB par Région (Milliards USD)',
+                                   color='Région',
+                                   color_discrete_sequence=px.colors.qualitative.Set3),
+            # Chômage par région
+            'chomage_regional': px.bar(df_regions, 
+                                       x='Région', 
+                                       y='Taux_Chomage',
+                                       title='Taux de Chômage par Région (%)',
+                                       color='Taux_Chomage',
+                                       color_continuous_scale='Reds')
+        }
+    
+    def export_figures(self, instantane):
+        """Figures de chaque vue à partir d'un instantané `export_tables`"""
+        economie = instantane['economie']
+        return {
+            'economie': {**self.overview_figures(economie['vue']),
+                         **self.trade_detail_figures(economie['commerce'], 'export', self.reference.produits_commerce.index[0]),
+                         **self.tourism_market_figures(economie['tourisme'], self.reference.marches_touristiques.index[0]),
+                         **self.correlation_figures(economie['correlations'])},
+            'secteurs': self.sectors_figures(instantane['secteurs']['vue']),
+            'investissements': self.investment_figures(instantane['investissements']['vue']),
+            'regions': self.regional_figures(instantane['regions']['vue'])
+        }
@@ -0,0 +1,251 @@
+# live_feed.py
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+from urllib.parse import urlparse
+
+import pandas as pd
+
+
+def _demarrer_boucle(coroutine, nom):
+    """Exécute une coroutine dans son propre thread et sa propre boucle asyncio"""
+    boucle = asyncio.new_event_loop()
+    thread = threading.Thread(target=boucle.run_until_complete, args=(coroutine,), name=nom, daemon=True)
+    thread.start()
+    return boucle, thread
+
+
+class LiveFeedConsumer:
+    """Consomme un flux d'indicateurs (socket TCP local ou fichier suivi en continu)
+
+    Chaque message est une ligne JSON :
+    {"dataset": "economic_data", "date": "2026-10-31", "valeurs": {"inflation": 4.1}}
+
+    Les messages sont regroupés par lots (taille ou délai), les rafales sur une
+    même période sont fusionnées, puis le lot est écrit via `ecrire(dataset,
+    lignes)` dans un thread à part : les sessions Streamlit ne font que lire.
+    """
+
+    def __init__(self, ecrire, source, taille_lot=500, intervalle=0.5, depuis_debut=False):
+        self.ecrire = ecrire
+        self.source = source
+        self.taille_lot = taille_lot
+        self.intervalle = intervalle
+        self.depuis_debut = depuis_debut
+        self.stats = {'messages': 0, 'lots': 0, 'lignes_ecrites': 0, 'erreurs': 0}
+        self._boucle = None
+        self._tache = None
+
+    def start(self):
+        """Démarre la consommation en arrière-plan"""
+        self._boucle, _ = _demarrer_boucle(self._consommer(), 'live-feed')
+        return self
+
+    def stop(self):
+        """Arrête la consommation"""
+        if self._boucle is not None and self._tache is not None:
+            self._boucle.call_soon_threadsafe(self._tache.cancel)
+
+    async def _consommer(self):
+        self._tache = asyncio.current_task()
+        file = asyncio.Queue(maxsize=10000)
+        lecteur = asyncio.create_task(self._lire(file))
+        try:
+            await self._ecrire_par_lots(file)
+        finally:
+            lecteur.cancel()
+
+    async def _lire(self, file):
+        """Lit la source en continu, avec reconnexion en cas de coupure"""
+        url = urlparse(self.source)
+        while True:
+            try:
+                if url.scheme == 'tcp':
+                    await self._lire_socket(url.hostname, url.port, file)
+                else:
+                    await self._suivre_fichier(url.path or self.source, file)
+            except (ConnectionError, OSError):
+                self.stats['erreurs'] += 1
+            await asyncio.sleep(1.0)
+
+    async def _lire_socket(self, hote, port, file):
+        reader, writer = await asyncio.open_connection(hote, port)
+        try:
+            while True:
+                ligne = await reader.readline()
+                if not ligne:
+                    return
+                await self._recevoir(ligne, file)
+        finally:
+            writer.close()
+
+    async def _suivre_fichier(self, chemin, file):
+        """Équivalent de `tail -f` sur un fichier de messages"""
+        with open(chemin, 'rb') as fichier:
+            if not self.depuis_debut:
+                fichier.seek(0, os.SEEK_END)
+            while True:
+                ligne = fichier.readline()
+                if ligne.endswith(b'\n'):
+                    await self._recevoir(ligne, file)
+                else:
+                    fichier.seek(-len(ligne), os.SEEK_CUR)  # Ligne incomplète : on la relira
+                    await asyncio.sleep(0.2)
+
+    async def _recevoir(self, ligne, file):
+        try:
+            message = json.loads(ligne)
+        except ValueError:
+            self.stats['erreurs'] += 1
+            return
+        self.stats['messages'] += 1
+        await file.put(message)
+
+    async def _ecrire_par_lots(self, file):
+        """Regroupe les messages jusqu'à `taille_lot` ou `intervalle` secondes, puis écrit"""
+        boucle = asyncio.get_running_loop()
+        while True:
+            lot = [await file.get()]
+            echeance = boucle.time() + self.intervalle
+            while len(lot) < self.taille_lot:
+                restant = echeance - boucle.time()
+                if restant <= 0:
+                    break
+                try:
+                    lot.append(await asyncio.wait_for(file.get(), restant))
+                except asyncio.TimeoutError:
+                    break
+
+            # L'écriture (pandas, verrou du store) ne bloque pas la lecture du flux ;
+            # un lot en échec est compté, la consommation continue
+            try:
+                await asyncio.to_thread(self._appliquer, lot)
+            except Exception:
+                self.stats['erreurs'] += 1
+
+    def _appliquer(self, lot):
+        """Fusionne les messages d'un lot par jeu de données et période, puis les écrit"""
+        fusion = {}
+        for message in lot:
+            # Message rejeté en entier s'il est mal formé : une valeur invalide n'écarte pas le reste du lot
+            try:
+                dataset = message['dataset']
+                valeurs = message['valeurs']
+                if not isinstance(dataset, str) or not isinstance(valeurs, dict):
+                    raise TypeError("dataset ou valeurs mal formés")
+                # Périodes mensuelles : la date est ramenée à la fin de son mois
+                date = pd.Timestamp(message['date'])
+                if pd.isna(date):
+                    raise ValueError("date manquante")
+                date = date.normalize() + pd.offsets.MonthEnd(0)
+                valeurs = {str(colonne): float(valeur) for colonne, valeur in valeurs.items()}
+            except (KeyError, TypeError, ValueError, OverflowError):
+                self.stats['erreurs'] += 1
+                continue
+            fusion.setdefault(dataset, {}).setdefault(date, {}).update(valeurs)
+
+        for dataset, lignes in fusion.items():
+            try:
+                frame = pd.DataFrame.from_dict(lignes, orient='index').rename_axis('date').reset_index()
+                self.ecrire(dataset, frame)
+            except Exception:
+                self.stats['erreurs'] += 1
+                continue
+            self.stats['lignes_ecrites'] += len(frame)
+        self.stats['lots'] += 1
+
+
+class LocalPublisher:
+    """Publieur local de substitution : diffuse des indicateurs simulés sur un socket TCP
+
+    Les valeurs du mois en cours sont révisées à chaque message, comme des
+    estimations provisoires. Sert au développement et aux tests du consommateur.
+    """
+
+    def __init__(self, hote='127.0.0.1', port=0, intervalle=1.0):
+        self.hote = hote
+        self.port = port
+        self.intervalle = intervalle
+        self._clients = set()
+        self._pret = threading.Event()
+        self._etat = {
+            'croissance_pib': 3.5,
+            'inflation': 4.0,
+            'taux_chomage': 7.5,
+            'taux_change_usd': 40.0,
+            'reserves_devises': 6.8,
+            'dette_publique': 68.0
+        }
+
+    def start(self):
+        """Démarre le serveur en arrière-plan et attend qu'il écoute"""
+        _demarrer_boucle(self._servir(), 'live-publisher')
+        self._pret.wait(timeout=5)
+        return self
+
+    @property
+    def url(self):
+        return f"tcp://{self.hote}:{self.port}"
+
+    def generer(self):
+        """Prochaine mise à jour simulée des indicateurs du mois en cours"""
+        etat = self._etat
+        etat['croissance_pib'] += random.uniform(-0.1, 0.1)
+        etat['inflation'] = min(max(etat['inflation'] + random.uniform(-0.2, 0.2), 2.5), 5.5)
+        etat['taux_chomage'] = min(max(etat['taux_chomage'] + random.uniform(-0.1, 0.1), 6.5), 8.5)
+        etat['taux_change_usd'] = min(max(etat['taux_change_usd'] + random.uniform(-0.3, 0.3), 38), 42)
+        etat['reserves_devises'] = min(max(etat['reserves_devises'] + random.uniform(-0.05, 0.05), 6), 7.5)
+        etat['dette_publique'] = min(max(etat['dette_publique'] + random.uniform(-0.2, 0.2), 65), 72)
+
+        fin_de_mois = pd.Timestamp.now().normalize() + pd.offsets.MonthEnd(0)
+        return {
+            'dataset': 'economic_data',
+            'date': fin_de_mois.date().isoformat(),
+            'valeurs': {cle: round(valeur, 4) for cle, valeur in etat.items()}
+        }
+
+    def ecrire_fichier(self, chemin, nombre=1):
+        """Ajoute des messages à un fichier, pour tester la lecture en `tail -f`"""
+        with open(chemin, 'a', encoding='utf-8') as fichier:
+            for _ in range(nombre):
+                fichier.write(json.dumps(self.generer()) + '\n')
+
+    async def _servir(self):
+        serveur = await asyncio.start_server(self._connexion, self.hote, self.port)
+        self.port = serveur.sockets[0].getsockname()[1]
+        self._pret.set()
+        async with serveur:
+            while True:
+                await asyncio.sleep(self.intervalle)
+                if self._clients:
+                    self._diffuser(json.dumps(self.generer()) + '\n')
+
+    async def _connexion(self, reader, writer):
+        self._clients.add(writer)
+        try:
+            await reader.read()  # Attend la déconnexion du client
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    def _diffuser(self, message):
+        for writer in list(self._clients):
+            if writer.is_closing():
+                self._clients.discard(writer)
+            else:
+                writer.write(message.encode('utf-8'))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publieur local d'indicateurs simulés pour le dashboard")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--intervalle', type=float, default=1.0)
+    args = parser.parse_args()
+
+    publieur = LocalPublisher(args.host, args.port, args.intervalle).start()
+    print(f"Flux disponible sur {publieur.url}")
+    threading.Event().wait()
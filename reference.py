@@ -0,0 +1,63 @@
+# reference.py
+import json
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+CHEMIN_REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'reference.json')
+
+
+class ReferenceData:
+    """Registre des données de référence, chargé une fois et partagé par toutes les vues
+
+    Les tables sont indexées par leur clé naturelle (secteur, région, pays) et
+    les dérivés utilisés par les graphiques (couleurs, totaux, parts) sont
+    précalculés au chargement.
+    """
+
+    def __init__(self, chemin=CHEMIN_REFERENCE):
+        with open(chemin, encoding='utf-8') as fichier:
+            brut = json.load(fichier)
+
+        self.version = brut['version']
+
+        # Secteurs économiques
+        self.secteurs = pd.DataFrame(brut['secteurs']).set_index('secteur')
+        self.total_emplois = int(self.secteurs['emplois'].sum())
+        self.total_poids_pib = float(self.secteurs['poids_pib'].sum())
+        self.secteurs['part_emploi_total'] = self.secteurs['emplois'] / self.total_emplois * 100
+        self.couleurs_secteurs = self.secteurs['couleur'].to_dict()
+        self.secteurs_dict = {
+            secteur: {colonne: valeur for colonne, valeur in info.items() if colonne != 'part_emploi_total'}
+            for secteur, info in self.secteurs.to_dict('index').items()
+        }
+
+        # Régions, infrastructures et projets
+        self.regions = pd.DataFrame(brut['regions']).set_index('Région')
+        self.infrastructures = pd.DataFrame(brut['infrastructures']).set_index('Nom')
+        self.projets = pd.DataFrame(brut['projets']).set_index('Nom')
+
+        # Comparaison avec les pays de la région
+        self.comparaison_regionale = pd.DataFrame(brut['comparaison_regionale']).set_index('pays')
+
+        # Commerce extérieur : produits par flux et répartition habituelle par partenaire
+        commerce = brut['commerce']
+        self.partenaires = commerce['partenaires']
+        self.produits_commerce = pd.DataFrame(commerce['produits']).set_index('produit')
+        self.affinites_partenaires = (pd.DataFrame(self.produits_commerce.pop('partenaires').tolist(),
+                                                   index=self.produits_commerce.index)[self.partenaires])
+
+        # Marchés touristiques : part des arrivées et profil saisonnier normalisé (janvier à décembre)
+        tourisme = brut['tourisme']
+        self.arrivees_annuelles_normales = tourisme['arrivees_annuelles_normales']
+        self.marches_touristiques = pd.DataFrame(tourisme['marches']).set_index('marche')
+        saisonnalite = pd.DataFrame(self.marches_touristiques.pop('saisonnalite').tolist(),
+                                    index=self.marches_touristiques.index, columns=range(1, 13))
+        self.saisonnalite_marches = saisonnalite.div(saisonnalite.mean(axis=1), axis=0)
+
+
+@lru_cache(maxsize=None)
+def get_reference_data(chemin=CHEMIN_REFERENCE):
+    """Instance unique du registre par fichier de référence"""
+    return ReferenceData(chemin)
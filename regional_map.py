@@ -0,0 +1,212 @@
+# regional_map.py
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+CHEMIN_CONTOURS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'regions_maurice.geojson')
+
+# Tolérances de simplification précalculées (degrés), de la plus grossière à la plus fine
+TOLERANCES = (0.002, 0.001, 0.0005, 0.00025)
+PIXELS_CARTE = 700  # Largeur de rendu de référence : une tolérance de 2 px suffit
+ECHELLE_LONGITUDE = np.cos(np.radians(20.2))  # Degrés de longitude ramenés à des degrés de latitude
+
+
+def encoder_polyligne(points, precision=5):
+    """Encodage « polyline » : coordonnées quantifiées, différences successives en base64 variable"""
+    entiers = np.round(np.asarray(points)[:, ::-1] * 10 ** precision).astype(np.int64)
+    deltas = np.diff(entiers, axis=0, prepend=0).ravel()
+    caracteres = []
+    for valeur in ((deltas << 1) ^ (deltas >> 63)).tolist():
+        while valeur >= 0x20:
+            caracteres.append(chr((0x20 | (valeur & 0x1f)) + 63))
+            valeur >>= 5
+        caracteres.append(chr(valeur + 63))
+    return ''.join(caracteres)
+
+
+def decoder_polyligne(texte, precision=5):
+    """Inverse de `encoder_polyligne` : tableau (n, 2) de (longitude, latitude)"""
+    valeurs, valeur, decalage = [], 0, 0
+    for caractere in texte:
+        octet = ord(caractere) - 63
+        valeur |= (octet & 0x1f) << decalage
+        decalage += 5
+        if octet < 0x20:
+            valeurs.append(~(valeur >> 1) if valeur & 1 else valeur >> 1)
+            valeur, decalage = 0, 0
+    points = np.cumsum(np.asarray(valeurs, dtype=np.int64).reshape(-1, 2), axis=0) / 10 ** precision
+    return points[:, ::-1]
+
+
+def importance_douglas_peucker(points):
+    """Tolérance maximale à laquelle chaque sommet survit à Douglas-Peucker
+
+    Un seul passage suffit pour toutes les résolutions : simplifier à la
+    tolérance t revient à garder les sommets d'importance >= t. L'importance
+    d'un sommet est plafonnée par celle de son parent, les niveaux sont donc
+    emboîtés.
+    """
+    plan = points * [ECHELLE_LONGITUDE, 1.0]
+    importance = np.zeros(len(points))
+    importance[[0, -1]] = np.inf
+    pile = [(0, len(points) - 1, np.inf)]
+
+    while pile:
+        i, j, plafond = pile.pop()
+        if j <= i + 1:
+            continue
+        segment = plan[j] - plan[i]
+        relatifs = plan[i + 1:j] - plan[i]
+        longueur = np.hypot(*segment)
+        if longueur > 0:
+            distances = np.abs(segment[0] * relatifs[:, 1] - segment[1] * relatifs[:, 0]) / longueur
+        else:
+            distances = np.hypot(relatifs[:, 0], relatifs[:, 1])
+        k = i + 1 + int(np.argmax(distances))
+        importance[k] = min(distances[k - i - 1], plafond)
+        pile.extend([(i, k, importance[k]), (k, j, importance[k])])
+
+    if np.array_equal(points[0], points[-1]):
+        # Anneau isolé : on garde toujours un triangle
+        importance[np.argsort(importance[1:-1])[-2:] + 1] = np.inf
+    return importance
+
+
+class RegionalGeometry:
+    """Contours régionaux en plusieurs résolutions, sans accès réseau
+
+    Les anneaux sont découpés en arcs aux points où les régions voisines
+    changent ; chaque frontière partagée n'est simplifiée qu'une fois, les
+    régions restent donc jointives à toutes les résolutions. Les niveaux sont
+    conservés sur disque en GeoJSON aux coordonnées encodées (polyline), et
+    seul le niveau adapté à l'étendue affichée est décodé.
+    """
+
+    def __init__(self, chemin=CHEMIN_CONTOURS, dossier_cache=None):
+        with open(chemin, 'rb') as fichier:
+            contenu = fichier.read()
+        empreinte = hashlib.sha256(contenu).hexdigest()[:16]
+        dossier_cache = dossier_cache or os.path.join(os.path.dirname(chemin), '_cache')
+        chemin_cache = os.path.join(dossier_cache, f"{os.path.splitext(os.path.basename(chemin))[0]}.{empreinte}.json")
+
+        if os.path.exists(chemin_cache):
+            with open(chemin_cache, encoding='utf-8') as fichier:
+                self.niveaux = json.load(fichier)
+        else:
+            self.niveaux = self._precalculer(json.loads(contenu))
+            os.makedirs(dossier_cache, exist_ok=True)
+            temporaire = f"{chemin_cache}.{os.getpid()}.tmp"
+            with open(temporaire, 'w', encoding='utf-8') as fichier:
+                json.dump(self.niveaux, fichier, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temporaire, chemin_cache)
+
+        self.regions = [f['properties']['Région'] for f in self.niveaux[str(TOLERANCES[0])]['features']]
+        self.bbox = {f['properties']['Région']: tuple(f['bbox']) for f in self.niveaux[str(TOLERANCES[0])]['features']}
+
+    def level_for(self, etendue):
+        """Tolérance la plus grossière encore invisible (2 px) pour une étendue en degrés"""
+        seuil = 2 * etendue / PIXELS_CARTE
+        return next((t for t in TOLERANCES if t <= seuil), TOLERANCES[-1])
+
+    def encoded(self, tolerance):
+        """FeatureCollection encodée d'un niveau de simplification"""
+        return self.niveaux[str(tolerance)]
+
+    def view(self, regions):
+        """Emprise (lon_min, lat_min, lon_max, lat_max) d'un ensemble de régions, avec marge"""
+        boites = np.array([self.bbox[region] for region in regions])
+        xmin, ymin = boites[:, :2].min(axis=0)
+        xmax, ymax = boites[:, 2:].max(axis=0)
+        marge = 0.05 * max(xmax - xmin, ymax - ymin)
+        return (xmin - marge, ymin - marge, xmax + marge, ymax + marge)
+
+    @lru_cache(maxsize=32)
+    def rings(self, tolerance, emprise=None):
+        """Anneaux décodés par région au niveau demandé, limités aux régions visibles"""
+        anneaux = {}
+        for feature in self.encoded(tolerance)['features']:
+            xmin, ymin, xmax, ymax = feature['bbox']
+            if emprise is not None and (xmax < emprise[0] or xmin > emprise[2] or ymax < emprise[1] or ymin > emprise[3]):
+                continue
+            anneaux[feature['properties']['Région']] = [
+                decoder_polyligne(anneau) for polygone in feature['geometry']['coordinates'] for anneau in polygone]
+        return anneaux
+
+    def _precalculer(self, collection):
+        """Découpe en arcs partagés, importance Douglas-Peucker, puis encodage de chaque niveau"""
+        features = collection['features']
+        polygones = [
+            [[np.asarray(anneau, dtype=float) for anneau in polygone]
+             for polygone in (f['geometry']['coordinates'] if f['geometry']['type'] == 'MultiPolygon'
+                              else [f['geometry']['coordinates']])]
+            for f in features
+        ]
+
+        # Régions bordant chaque arête
+        aretes = {}
+        for i, feature in enumerate(polygones):
+            for polygone in feature:
+                for anneau in polygone:
+                    for a, b in zip(map(tuple, anneau[:-1]), map(tuple, anneau[1:])):
+                        aretes.setdefault(frozenset((a, b)), set()).add(i)
+
+        # Découpage des anneaux là où l'ensemble des voisins change, arcs dédoublonnés
+        arcs, index_arcs = [], {}
+        references = []
+        for feature in polygones:
+            references.append([])
+            for polygone in feature:
+                references[-1].append([])
+                for anneau in polygone:
+                    voisins = [aretes[frozenset((tuple(a), tuple(b)))] for a, b in zip(anneau[:-1], anneau[1:])]
+                    coupures = [k for k in range(len(voisins)) if voisins[k] != voisins[k - 1]] or [0]
+                    ouvert = np.vstack([anneau[:-1], anneau[:-1]])  # Deux tours pour découper sans modulo
+                    fins = coupures[1:] + [coupures[0] + len(voisins)]
+                    morceaux = []
+                    for debut, fin in zip(coupures, fins):
+                        arc = ouvert[debut:fin + 1]
+                        cle, cle_inverse = arc.tobytes(), arc[::-1].tobytes()
+                        if cle in index_arcs:
+                            morceaux.append((index_arcs[cle], False))
+                        elif cle_inverse in index_arcs:
+                            morceaux.append((index_arcs[cle_inverse], True))
+                        else:
+                            index_arcs[cle] = len(arcs)
+                            arcs.append(arc)
+                            morceaux.append((len(arcs) - 1, False))
+                    references[-1][-1].append(morceaux)
+
+        importances = [importance_douglas_peucker(arc) for arc in arcs]
+
+        niveaux = {}
+        for tolerance in TOLERANCES:
+            simplifies = [arc[importance >= tolerance] for arc, importance in zip(arcs, importances)]
+            sorties = []
+            for feature, refs in zip(features, references):
+                coordonnees, points = [], []
+                for polygone in refs:
+                    anneaux = []
+                    for anneau in polygone:
+                        morceaux = [simplifies[k][::-1] if inverse else simplifies[k] for k, inverse in anneau]
+                        sommets = np.vstack([morceaux[0]] + [m[1:] for m in morceaux[1:]])
+                        anneaux.append(encoder_polyligne(sommets))
+                        points.append(sommets)
+                    coordonnees.append(anneaux)
+                tous = np.vstack(points)
+                sorties.append({
+                    'type': 'Feature',
+                    'properties': feature['properties'],
+                    'bbox': [*tous.min(axis=0).tolist(), *tous.max(axis=0).tolist()],
+                    'geometry': {'type': 'MultiPolygon', 'coordinates': coordonnees}
+                })
+            niveaux[str(tolerance)] = {'type': 'FeatureCollection', 'encoding': 'polyline5', 'features': sorties}
+        return niveaux
+
+
+@lru_cache(maxsize=None)
+def get_regional_geometry(chemin=CHEMIN_CONTOURS):
+    """Instance unique des contours par fichier"""
+    return RegionalGeometry(chemin)
@@ -0,0 +1,179 @@
+# resampling.py
+import numpy as np
+import pandas as pd
+
+# Granularités disponibles, de la plus fine à la plus grossière
+NIVEAUX = {
+    'M': 'Mensuel',
+    'Q': 'Trimestriel',
+    'Y': 'Annuel'
+}
+
+# Agrégation à appliquer lorsqu'on remonte d'un niveau (mois → trimestre → année)
+CONSOLIDATION = {
+    'sum': 'sum',
+    'mean': 'mean',
+    'last': 'last',
+    'first': 'first',
+    'min': 'min',
+    'max': 'max',
+    'count': 'sum'
+}
+
+
+def choisir_niveau(date_debut, date_fin):
+    """Choisit la granularité adaptée à la période affichée"""
+    debut = pd.Timestamp(date_debut)
+    fin = pd.Timestamp(date_fin)
+    nb_mois = (fin.year - debut.year) * 12 + fin.month - debut.month + 1
+
+    if nb_mois <= 36:       # Jusqu'à 3 ans : données mensuelles
+        return 'M'
+    elif nb_mois <= 96:     # Jusqu'à 8 ans : données trimestrielles
+        return 'Q'
+    return 'Y'
+
+
+class HierarchicalResampler:
+    """Matérialise et maintient les niveaux mensuel, trimestriel et annuel de chaque jeu de données"""
+
+    def __init__(self):
+        self._specs = {}
+        self._brut = {}
+        self._niveaux = {}
+        self.versions = {}
+
+    def register(self, nom, data, colonne_date, agregations, continu=True):
+        """Enregistre un jeu de données et calcule tous ses niveaux
+
+        `agregations` associe chaque colonne de sortie à un couple
+        (colonne source, fonction) : 'sum', 'mean', 'last', 'count'...
+        `continu` indique une série mensuelle sans mois manquant ; une table
+        d'événements (continu=False) n'est jamais tronquée aux mois observés.
+        """
+        self._specs[nom] = {
+            'colonne_date': colonne_date,
+            'agregations': agregations,
+            'continu': continu
+        }
+        if data[colonne_date].is_monotonic_increasing and data.index.equals(pd.RangeIndex(len(data))):
+            self._brut[nom] = data  # Déjà trié : pas de copie (données partagées en lecture seule)
+        else:
+            self._brut[nom] = data.sort_values(colonne_date).reset_index(drop=True)
+        self._niveaux[nom] = self._materialiser(nom, self._brut[nom])
+        self.versions[nom] = self.versions.get(nom, 0) + 1
+
+    def replace(self, nom, data):
+        """Remplace entièrement un jeu de données déjà enregistré (même spécification)"""
+        self.register(nom, data, **self._specs[nom])
+
+    def append(self, nom, nouvelles_lignes, remplacer=False):
+        """Ajoute de nouvelles lignes et met à jour uniquement les périodes concernées
+
+        Avec `remplacer=True`, les lignes existantes aux mêmes dates sont
+        remplacées (révisions d'un flux live) au lieu d'être cumulées.
+        """
+        if nouvelles_lignes.empty:
+            return
+
+        colonne_date = self._specs[nom]['colonne_date']
+        brut = self._brut[nom]
+        if remplacer:
+            brut = brut[~brut[colonne_date].isin(nouvelles_lignes[colonne_date])]
+        brut = (pd.concat([brut, nouvelles_lignes], ignore_index=True)
+                .sort_values(colonne_date, kind='stable')
+                .reset_index(drop=True))
+
+        # Premier mois touché par l'ajout : tout ce qui précède reste valide
+        premier_mois = nouvelles_lignes[colonne_date].min().to_period('M')
+        mois_brut = brut[colonne_date].dt.to_period('M')
+        debut_annee = premier_mois.asfreq('Y').asfreq('M', how='start')
+        recent = brut[mois_brut >= debut_annee]
+
+        # Recalcul limité à l'année en cours, qui couvre aussi le trimestre et le mois
+        niveaux = {}
+        for niveau, frame in self._materialiser(nom, recent).items():
+            conserve = self._niveaux[nom][niveau]
+            niveaux[niveau] = pd.concat([conserve[conserve.index < frame.index.min()], frame])
+
+        # Rien n'est modifié tant que le calcul n'a pas abouti
+        self._brut[nom] = brut
+        self._niveaux[nom] = niveaux
+        self.versions[nom] += 1
+
+    def level(self, nom, niveau='M', complets=False):
+        """Retourne un niveau d'agrégation avec une colonne de date de fin de période
+
+        Avec `complets=True`, les trimestres et années d'une série continue qui
+        débordent des mois observés (période en cours, début de l'historique)
+        sont écartés.
+        """
+        frame = self._niveaux[nom][niveau]
+        if complets:
+            frame = frame[self._couverts(nom, frame.index)]
+        return self._avec_dates(nom, frame)
+
+    def slice(self, nom, date_debut, date_fin, niveau=None):
+        """Extrait une période au niveau demandé, ou au niveau adapté à sa durée
+
+        Aux niveaux trimestriel et annuel d'une série continue, seules les
+        périodes entièrement comprises dans l'intervalle demandé et dans les
+        mois observés sont conservées : une somme partielle n'est pas comparable
+        aux autres. Une table d'événements garde toute période qui chevauche
+        l'intervalle.
+        """
+        if niveau is None:
+            niveau = choisir_niveau(date_debut, date_fin)
+
+        frame = self._niveaux[nom][niveau]
+        debut = pd.Timestamp(date_debut).to_period('M')
+        fin = pd.Timestamp(date_fin).to_period('M')
+        premiers, derniers = frame.index.asfreq('M', how='start'), frame.index.asfreq('M', how='end')
+        if self._specs[nom]['continu']:
+            extrait = frame[(premiers >= debut) & (derniers <= fin) & self._couverts(nom, frame.index)]
+        else:
+            # Table d'événements : toute période qui chevauche l'intervalle
+            extrait = frame[(derniers >= debut) & (premiers <= fin)]
+        return self._avec_dates(nom, extrait), niveau
+
+    def _couverts(self, nom, periodes):
+        """Périodes dont tous les mois sont compris entre le premier et le dernier mois observés (séries continues)"""
+        if not self._specs[nom]['continu']:
+            return np.ones(len(periodes), dtype=bool)
+        mois = self._niveaux[nom]['M'].index
+        return (periodes.asfreq('M', how='start') >= mois.min()) & (periodes.asfreq('M', how='end') <= mois.max())
+
+    def _avec_dates(self, nom, frame):
+        """Remplace l'index de périodes par une colonne de date de fin de période
+
+        Pour une série continue, la date est bornée au dernier mois observé.
+        """
+        colonne_date = self._specs[nom]['colonne_date']
+        dates = frame.index.to_timestamp(how='end').normalize()
+        if self._specs[nom]['continu']:
+            dernier = self._niveaux[nom]['M'].index.max().to_timestamp(how='end').normalize()
+            dates = dates.where(dates <= dernier, dernier)
+        resultat = frame.reset_index(drop=True)
+        resultat.insert(0, colonne_date, dates)
+        return resultat
+
+    def _materialiser(self, nom, data):
+        """Calcule les trois niveaux à partir de lignes brutes"""
+        spec = self._specs[nom]
+        periodes = data[spec['colonne_date']].dt.to_period('M')
+
+        mensuel = data.groupby(periodes).agg(**spec['agregations'])
+        mensuel.index.name = 'periode'
+
+        consolidation = {
+            colonne: CONSOLIDATION[fonction]
+            for colonne, (source, fonction) in spec['agregations'].items()
+        }
+
+        niveaux = {'M': mensuel}
+        for niveau in ['Q', 'Y']:
+            agrege = mensuel.groupby(mensuel.index.asfreq(niveau)).agg(consolidation)
+            agrege.index.name = 'periode'
+            niveaux[niveau] = agrege
+
+        return niveaux
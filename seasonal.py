@@ -0,0 +1,104 @@
+# seasonal.py
+import numpy as np
+import pandas as pd
+
+PERIODE = 12
+DEMI_FENETRE = PERIODE // 2
+
+
+class SeasonalDecomposer:
+    """Décomposition saisonnière de toutes les séries mensuelles en un seul calcul vectorisé
+
+    Modèle multiplicatif (calculé sur le logarithme) : tendance par moyenne mobile
+    centrée 2×12, indices saisonniers par mois calendaire, résidu. Les sommes par
+    mois calendaire sont conservées : un nouveau mois ne recalcule que la fin de
+    la tendance et met à jour les indices en O(séries).
+    """
+
+    def __init__(self):
+        self.version = None
+        self.colonnes = []
+        self.dates = pd.DatetimeIndex([])
+        self._log = np.empty((0, 0))
+        self._tendance = np.empty((0, 0))
+        self._mois = np.empty(0, dtype=int)
+        self._sommes = np.zeros((PERIODE, 0))
+        self._nombres = np.zeros(PERIODE)
+        self._composantes = None
+
+    def sync(self, data, version):
+        """Met à jour la décomposition pour une nouvelle version des séries (index de dates mensuelles)"""
+        if version == self.version:
+            return
+
+        colonnes = list(data.columns)
+        log = np.log(np.clip(data.to_numpy(dtype=float), 1e-9, None))
+        n = len(self._log)
+
+        if colonnes == self.colonnes and 0 < n <= len(log) and np.array_equal(log[:n], self._log):
+            # Sommes prolongées sur des copies : l'état publié n'est jamais modifié en place
+            tendance, sommes, nombres = self._tendance, self._sommes.copy(), self._nombres.copy()
+        else:
+            # Révision ou nouvelles séries : on repart de zéro
+            n = 0
+            tendance = np.empty((0, len(colonnes)))
+            sommes, nombres = np.zeros((PERIODE, len(colonnes))), np.zeros(PERIODE)
+
+        mois = data.index.month.to_numpy()
+        tendance = self._etendre(log, mois, n, tendance, sommes, nombres)
+
+        (self.colonnes, self.dates, self._log, self._tendance, self._mois,
+         self._sommes, self._nombres, self._composantes) = (
+            colonnes, pd.DatetimeIndex(data.index), log, tendance, mois, sommes, nombres, None)
+        self.version = version
+
+    def component(self, colonne):
+        """Tendance, facteur saisonnier et facteur résiduel d'une série"""
+        tendance, saison, residu = self._calculer_composantes()
+        i = self.colonnes.index(colonne)
+        return pd.DataFrame({
+            'date': self.dates,
+            'observe': np.exp(self._log[:, i]),
+            'tendance': tendance[:, i],
+            'saisonnalite': saison[:, i],
+            'residu': residu[:, i]
+        })
+
+    def seasonal_indices(self):
+        """Facteurs saisonniers par mois calendaire (lignes) et par série (colonnes)"""
+        indices = self._indices()
+        return pd.DataFrame(np.exp(indices), index=range(1, PERIODE + 1), columns=self.colonnes)
+
+    def _etendre(self, log, mois, n_ancien, tendance_ancienne, sommes, nombres):
+        """Tendance aux positions devenues calculables ; les écarts saisonniers sont cumulés dans `sommes`"""
+        tendance = np.full(log.shape, np.nan)
+        tendance[:n_ancien] = tendance_ancienne
+
+        # La moyenne centrée à t demande 6 mois après t
+        debut, fin = max(DEMI_FENETRE, n_ancien - DEMI_FENETRE), len(log) - DEMI_FENETRE
+        if fin > debut:
+            tendance[debut:fin] = self._moyenne_centree(log, debut, fin)
+            np.add.at(sommes, mois[debut:fin] - 1, log[debut:fin] - tendance[debut:fin])
+            np.add.at(nombres, mois[debut:fin] - 1, 1)
+        return tendance
+
+    def _moyenne_centree(self, log, debut, fin):
+        """Moyenne mobile 2×12 aux positions [debut, fin), via sommes cumulées"""
+        fenetre = log[debut - DEMI_FENETRE:fin + DEMI_FENETRE]
+        cumul = np.vstack([np.zeros((1, log.shape[1])), np.cumsum(fenetre, axis=0)])
+        t = np.arange(DEMI_FENETRE, DEMI_FENETRE + fin - debut)
+        centre = cumul[t + DEMI_FENETRE] - cumul[t - DEMI_FENETRE + 1]
+        return (centre + 0.5 * (fenetre[t - DEMI_FENETRE] + fenetre[t + DEMI_FENETRE])) / PERIODE
+
+    def _indices(self):
+        """Indices saisonniers (log) centrés sur l'année"""
+        indices = self._sommes / np.maximum(self._nombres, 1)[:, None]
+        return indices - indices.mean(axis=0)
+
+    def _calculer_composantes(self):
+        """Composantes de toutes les séries, mises en cache jusqu'à la prochaine version"""
+        if self._composantes is None:
+            saison = self._indices()[self._mois - 1]
+            residu = self._log - self._tendance - saison
+            self._composantes = (np.exp(self._tendance), np.exp(saison), np.exp(residu))
+        return self._composantes
@@ -0,0 +1,172 @@
+# session_memory.py
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+
+def taille_objet(valeur, _vus=None):
+    """Estimation de l'empreinte mémoire d'un objet (DataFrame, tableau, figure, conteneurs)"""
+    if _vus is None:
+        _vus = set()
+    if id(valeur) in _vus:
+        return 0
+    _vus.add(id(valeur))
+
+    if isinstance(valeur, (pd.DataFrame, pd.Series, pd.Index)):
+        taille = valeur.memory_usage(deep=True)
+        return int(taille.sum() if hasattr(taille, 'sum') else taille)
+    if isinstance(valeur, np.ndarray):
+        return int(valeur.nbytes)
+    if hasattr(valeur, 'to_plotly_json'):  # Figures Plotly
+        return taille_objet(valeur.to_plotly_json(), _vus)
+    if isinstance(valeur, dict):
+        return sys.getsizeof(valeur) + sum(taille_objet(k, _vus) + taille_objet(v, _vus) for k, v in valeur.items())
+    if isinstance(valeur, (list, tuple, set, frozenset)):
+        return sys.getsizeof(valeur) + sum(taille_objet(v, _vus) for v in valeur)
+    return sys.getsizeof(valeur)
+
+
+class FigureSerialisee(dict):
+    """Figure Plotly conservée sous forme de dictionnaire (tableaux encodés), reconstruite à la lecture"""
+
+
+def serialiser(valeur):
+    """Remplace les figures Plotly (y compris dans des dict, listes, tuples) par leur forme sérialisée"""
+    if isinstance(valeur, go.Figure):
+        return FigureSerialisee(valeur.to_dict())
+    if isinstance(valeur, dict) and not isinstance(valeur, FigureSerialisee):
+        return {cle: serialiser(v) for cle, v in valeur.items()}
+    if type(valeur) in (list, tuple):
+        return type(valeur)(serialiser(v) for v in valeur)
+    return valeur
+
+
+def restaurer(valeur):
+    """Inverse de `serialiser` ; la figure a déjà été validée, elle n'est pas revalidée"""
+    if isinstance(valeur, FigureSerialisee):
+        return go.Figure(valeur, _validate=False)
+    if isinstance(valeur, dict):
+        return {cle: restaurer(v) for cle, v in valeur.items()}
+    if type(valeur) in (list, tuple):
+        return type(valeur)(restaurer(v) for v in valeur)
+    return valeur
+
+
+class SessionStateManager:
+    """État par session (filtres, caches de figures, résultats d'exploration) sous budget mémoire
+
+    Chaque entrée est mesurée à l'écriture, sous la forme même où elle est
+    conservée : les figures Plotly sont stockées sérialisées (dictionnaire aux
+    tableaux encodés) et reconstruites à la lecture. Au-delà du budget d'une
+    session, ses entrées les moins récemment utilisées sont évincées ; au-delà du budget
+    global, ce sont les moins récentes toutes sessions confondues. Les sessions
+    inactives depuis `inactivite_max` secondes sont libérées. Une entrée peut
+    porter une version (celle des données dont elle dérive) : lue avec une autre
+    version, elle est absente, et réécrite, elle remplace l'ancienne.
+    """
+
+    def __init__(self, budget_session=64 * 1024 ** 2, budget_global=512 * 1024 ** 2, inactivite_max=1800):
+        self.budget_session = budget_session
+        self.budget_global = budget_global
+        self.inactivite_max = inactivite_max
+        self._sessions = {}
+        self._lru_global = OrderedDict()  # (session, clé) -> taille, du moins au plus récent
+        self._total = 0
+        self._evictions = 0
+        self._verrou = threading.RLock()
+
+    def get(self, session_id, cle, defaut=None, version=None):
+        """Lit une entrée de la session (à la version demandée) et la marque comme récemment utilisée"""
+        with self._verrou:
+            self._expirer()
+            session = self._session(session_id)
+            if cle not in session['entrees'] or session['entrees'][cle][2] != version:
+                return defaut
+            session['entrees'].move_to_end(cle)
+            self._lru_global.move_to_end((session_id, cle))
+            return restaurer(session['entrees'][cle][0])
+
+    def set(self, session_id, cle, valeur, version=None):
+        """Enregistre une entrée, en évinçant si nécessaire ; retourne False si elle dépasse le budget"""
+        valeur = serialiser(valeur)
+        taille = taille_objet(valeur)
+        with self._verrou:
+            self._expirer()
+            self._retirer(session_id, cle)
+            if taille > min(self.budget_session, self.budget_global):
+                return False
+
+            session = self._session(session_id)
+            session['entrees'][cle] = (valeur, taille, version)
+            session['octets'] += taille
+            self._lru_global[(session_id, cle)] = taille
+            self._total += taille
+
+            # Budget de la session, puis budget global
+            while session['octets'] > self.budget_session:
+                self._retirer(session_id, next(iter(session['entrees'])), eviction=True)
+            while self._total > self.budget_global:
+                self._retirer(*next(iter(self._lru_global)), eviction=True)
+            return True
+
+    def get_or_compute(self, session_id, cle, calcul, version=None):
+        """Retourne l'entrée en cache à cette version, ou la calcule et tente de la conserver"""
+        manquant = object()
+        valeur = self.get(session_id, cle, manquant, version)
+        if valeur is manquant:
+            valeur = calcul()
+            self.set(session_id, cle, valeur, version)
+        return valeur
+
+    def drop_session(self, session_id):
+        """Libère toutes les entrées d'une session"""
+        with self._verrou:
+            for cle in list(self._sessions.get(session_id, {}).get('entrees', [])):
+                self._retirer(session_id, cle)
+            self._sessions.pop(session_id, None)
+
+    def usage(self, session_id=None):
+        """Consommation mémoire actuelle, globale et par session"""
+        with self._verrou:
+            self._expirer()
+            sessions = {
+                sid: {'octets': s['octets'], 'entrees': len(s['entrees']), 'inactif_s': time.monotonic() - s['acces']}
+                for sid, s in self._sessions.items()
+            }
+            return {
+                'octets': self._total,
+                'budget_global': self.budget_global,
+                'budget_session': self.budget_session,
+                'sessions': sessions if session_id is None else {session_id: sessions.get(session_id)},
+                'nb_sessions': len(self._sessions),
+                'evictions': self._evictions
+            }
+
+    def _session(self, session_id):
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = {'entrees': OrderedDict(), 'octets': 0, 'acces': 0.0}
+        session['acces'] = time.monotonic()
+        return session
+
+    def _retirer(self, session_id, cle, eviction=False):
+        session = self._sessions.get(session_id)
+        if session is None or cle not in session['entrees']:
+            return
+        _, taille, _ = session['entrees'].pop(cle)
+        session['octets'] -= taille
+        self._total -= taille
+        del self._lru_global[(session_id, cle)]
+        if eviction:
+            self._evictions += 1
+
+    def _expirer(self):
+        """Libère les sessions inactives (onglets fermés)"""
+        limite = time.monotonic() - self.inactivite_max
+        for session_id in [sid for sid, s in self._sessions.items() if s['acces'] < limite]:
+            self.drop_session(session_id)
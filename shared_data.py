@@ -0,0 +1,146 @@
+# shared_data.py
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+FICHIER_COURANT = 'CURRENT'
+FICHIER_MANIFESTE = 'manifest.json'
+
+
+class DatasetPublisher:
+    """Publie des tables en fichiers .npy (une colonne par fichier) sous un répertoire de version
+
+    La version publiée est désignée par le fichier CURRENT, remplacé
+    atomiquement (os.replace) une fois tous les fichiers écrits : un lecteur
+    voit soit l'ancienne version complète, soit la nouvelle. Les versions
+    antérieures au-delà de `conserver` sont supprimées ; les lecteurs qui les
+    ont encore en mémoire gardent un accès valide (fichiers déjà mappés).
+    """
+
+    def __init__(self, dossier, conserver=3):
+        self.dossier = dossier
+        self.conserver = conserver
+        os.makedirs(dossier, exist_ok=True)
+
+    def publish(self, tables, attributs=None):
+        """Écrit une nouvelle version et la rend courante ; retourne son nom"""
+        version = datetime.now().strftime('v%Y%m%d-%H%M%S-%f')
+        temporaire = os.path.join(self.dossier, f".{version}.tmp")
+        os.makedirs(temporaire)
+
+        manifeste = {'version': version, 'publie_le': datetime.now().isoformat(), 'attributs': attributs or {}, 'tables': {}}
+        for nom, table in tables.items():
+            colonnes = {}
+            for i, colonne in enumerate(table.columns):
+                valeurs = table[colonne].to_numpy()
+                texte = valeurs.dtype == object
+                if texte:
+                    # Chaînes en largeur fixe : seul format projetable en mémoire sans pickle
+                    valeurs = valeurs.astype(str)
+                fichier = f"{nom}.{i}.npy"
+                np.save(os.path.join(temporaire, fichier), valeurs, allow_pickle=False)
+                colonnes[colonne] = {'fichier': fichier, 'texte': bool(texte)}
+            manifeste['tables'][nom] = {'lignes': len(table), 'colonnes': colonnes}
+
+        with open(os.path.join(temporaire, FICHIER_MANIFESTE), 'w', encoding='utf-8') as fichier:
+            json.dump(manifeste, fichier, ensure_ascii=False, indent=2)
+        os.replace(temporaire, os.path.join(self.dossier, version))
+
+        # Bascule atomique du pointeur de version
+        pointeur = os.path.join(self.dossier, f".{FICHIER_COURANT}.{os.getpid()}.tmp")
+        with open(pointeur, 'w', encoding='utf-8') as fichier:
+            fichier.write(version)
+        os.replace(pointeur, os.path.join(self.dossier, FICHIER_COURANT))
+
+        self._nettoyer()
+        return version
+
+    def _nettoyer(self):
+        versions = sorted(nom for nom in os.listdir(self.dossier) if nom.startswith('v'))
+        for ancienne in versions[:-self.conserver]:
+            shutil.rmtree(os.path.join(self.dossier, ancienne), ignore_errors=True)
+
+
+class DatasetLoader:
+    """Attache en lecture seule la version courante publiée par `DatasetPublisher`
+
+    Les colonnes numériques et de dates sont projetées en mémoire (mmap) sans
+    copie : tous les processus qui attachent la même version partagent les
+    mêmes pages. Les colonnes de texte sont converties en objets Python.
+    """
+
+    def __init__(self, dossier):
+        self.dossier = dossier
+        self.version = None
+
+    def current_version(self):
+        """Version désignée par le pointeur CURRENT"""
+        with open(os.path.join(self.dossier, FICHIER_COURANT), encoding='utf-8') as fichier:
+            return fichier.read().strip()
+
+    def changed(self):
+        """Une nouvelle version a-t-elle été publiée depuis le dernier attachement ?"""
+        try:
+            return self.current_version() != self.version
+        except FileNotFoundError:
+            return False
+
+    def attach(self, tentatives=3):
+        """Tables et attributs de la version courante"""
+        for tentative in range(tentatives):
+            version = self.current_version()
+            try:
+                tables, attributs = self._charger(version)
+            except FileNotFoundError:
+                # Version supprimée entre la lecture du pointeur et l'ouverture : on relit le pointeur
+                if tentative == tentatives - 1:
+                    raise
+                time.sleep(0.1)
+                continue
+            self.version = version
+            return tables, attributs
+
+    def _charger(self, version):
+        repertoire = os.path.join(self.dossier, version)
+        with open(os.path.join(repertoire, FICHIER_MANIFESTE), encoding='utf-8') as fichier:
+            manifeste = json.load(fichier)
+
+        tables = {}
+        for nom, table in manifeste['tables'].items():
+            colonnes = {}
+            for colonne, description in table['colonnes'].items():
+                valeurs = np.load(os.path.join(repertoire, description['fichier']), mmap_mode='r')
+                colonnes[colonne] = valeurs.astype(object) if description['texte'] else valeurs
+            tables[nom] = pd.DataFrame(colonnes, copy=False)
+        return tables, {**manifeste['attributs'], 'version': version, 'publie_le': manifeste['publie_le']}
+
+
+if __name__ == "__main__":
+    # Processus unique qui génère/ingère les données et les publie pour les workers Streamlit
+    parser = argparse.ArgumentParser(description="Publication des données du dashboard en mémoire partagée")
+    parser.add_argument('--dossier', default='/dev/shm/maurice' if os.path.isdir('/dev/shm') else 'donnees_partagees')
+    parser.add_argument('--live', help="Flux à consommer (tcp://hôte:port ou fichier) ; republication à chaque changement")
+    parser.add_argument('--intervalle', type=float, default=5.0, help="Délai minimal entre deux publications (s)")
+    args = parser.parse_args()
+
+    from Dashboard import MauritiusDashboard
+    from live_feed import LiveFeedConsumer
+
+    dashboard = MauritiusDashboard()
+    publieur = DatasetPublisher(args.dossier)
+    print(f"Version {publieur.publish(*dashboard.shared_tables())} publiée dans {args.dossier}")
+
+    if args.live:
+        LiveFeedConsumer(dashboard.ingest, args.live).start()
+        publiee = dashboard.data_version()
+        while True:
+            time.sleep(args.intervalle)
+            if dashboard.data_version() != publiee:
+                publiee = dashboard.data_version()
+                print(f"Version {publieur.publish(*dashboard.shared_tables())} publiée")
@@ -0,0 +1,154 @@
+# sketches.py
+import heapq
+import itertools
+import math
+from collections import Counter
+
+import pandas as pd
+
+# Départage des ex æquo, unique entre tous les top-k pour qu'ils restent fusionnables
+_SEQUENCE = itertools.count()
+
+
+class TopK:
+    """Les k plus grandes valeurs d'un flux, dans un tas min de taille k (O(log k) par ajout)"""
+
+    def __init__(self, k=10):
+        self.k = k
+        self._tas = []
+
+    def add(self, valeur, enregistrement):
+        element = (valeur, next(_SEQUENCE), enregistrement)
+        if len(self._tas) < self.k:
+            heapq.heappush(self._tas, element)
+        elif valeur > self._tas[0][0]:
+            heapq.heapreplace(self._tas, element)
+
+    def merge(self, autre):
+        """Fusion de deux top-k : le top-k de l'union est dans l'union des top-k"""
+        fusion = TopK(self.k)
+        fusion._tas = heapq.nlargest(self.k, self._tas + autre._tas)
+        heapq.heapify(fusion._tas)
+        return fusion
+
+    def items(self):
+        """Enregistrements retenus, du plus grand au plus petit"""
+        return [enregistrement for _, _, enregistrement in sorted(self._tas, reverse=True)]
+
+
+class DDSketch:
+    """Esquisse de quantiles à erreur relative bornée (DDSketch), fusionnable
+
+    Les valeurs positives sont comptées dans des compartiments logarithmiques
+    de raison gamma = (1 + a) / (1 - a) : tout quantile est restitué à une
+    erreur relative `precision` près, quel que soit le nombre de valeurs.
+    """
+
+    def __init__(self, precision=0.01):
+        self.precision = precision
+        self.gamma = (1 + precision) / (1 - precision)
+        self._log_gamma = math.log(self.gamma)
+        self.compartiments = Counter()
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, valeur):
+        if valeur <= 0:
+            self.zeros += 1
+        else:
+            self.compartiments[math.ceil(math.log(valeur) / self._log_gamma)] += 1
+        self.count += 1
+        self.total += valeur
+        self.min = min(self.min, valeur)
+        self.max = max(self.max, valeur)
+
+    def merge(self, autre):
+        fusion = DDSketch(self.precision)
+        fusion.compartiments = self.compartiments + autre.compartiments
+        fusion.zeros = self.zeros + autre.zeros
+        fusion.count = self.count + autre.count
+        fusion.total = self.total + autre.total
+        fusion.min = min(self.min, autre.min)
+        fusion.max = max(self.max, autre.max)
+        return fusion
+
+    def quantile(self, q):
+        if self.count == 0:
+            return math.nan
+        rang = q * (self.count - 1)
+        if rang < self.zeros:
+            return max(self.min, 0.0)
+        cumul = self.zeros
+        for indice in sorted(self.compartiments):
+            cumul += self.compartiments[indice]
+            if cumul > rang:
+                # Milieu (relatif) du compartiment, borné par les extrêmes exacts
+                valeur = 2 * self.gamma ** indice / (self.gamma + 1)
+                return min(max(valeur, self.min), self.max)
+        return self.max
+
+
+class InvestmentSketches:
+    """Top-k et quantiles des projets, par cellule (type, pays, secteur)
+
+    Chaque projet met à jour sa seule cellule. Toute sélection de filtres est
+    une union de cellules, obtenue par fusion de leurs esquisses : ni parcours
+    ni tri de la table des projets.
+    """
+
+    DIMENSIONS = ('type_investissement', 'pays_origine', 'secteur')
+    MESURES = ('montant_usd_millions', 'emplois_crees')
+
+    def __init__(self, k=10, precision=0.01):
+        self.k = k
+        self.precision = precision
+        self._cellules = {}
+
+    def add(self, projet):
+        """Intègre un projet (dictionnaire ou ligne nommée)"""
+        cle = tuple(projet[dimension] for dimension in self.DIMENSIONS)
+        cellule = self._cellules.get(cle)
+        if cellule is None:
+            cellule = self._cellules[cle] = {
+                mesure: (TopK(self.k), DDSketch(self.precision)) for mesure in self.MESURES}
+        enregistrement = dict(projet)
+        for mesure, (top, esquisse) in cellule.items():
+            top.add(projet[mesure], enregistrement)
+            esquisse.add(projet[mesure])
+
+    def add_frame(self, projets):
+        for projet in projets.to_dict('records'):
+            self.add(projet)
+
+    def query(self, mesure, **filtres):
+        """Top-k et esquisse fusionnés sur les cellules correspondant aux filtres (listes de valeurs)"""
+        top, esquisse = TopK(self.k), DDSketch(self.precision)
+        for cle, cellule in self._cellules.items():
+            if all(valeurs is None or cle[self.DIMENSIONS.index(dimension)] in valeurs
+                   for dimension, valeurs in filtres.items()):
+                top, esquisse = top.merge(cellule[mesure][0]), esquisse.merge(cellule[mesure][1])
+        return top, esquisse
+
+    def values(self, dimension):
+        """Valeurs observées d'une dimension"""
+        return sorted({cle[self.DIMENSIONS.index(dimension)] for cle in self._cellules})
+
+    def top(self, mesure, **filtres):
+        """Les k projets les plus importants selon une mesure"""
+        return pd.DataFrame(self.query(mesure, **filtres)[0].items())
+
+    def distribution(self, mesure, par, quantiles=(0.25, 0.5, 0.75), **filtres):
+        """Quantiles d'une mesure pour chaque valeur d'une dimension, avec min, max et effectif"""
+        valeurs = self.values(par)
+        if filtres.get(par) is not None:
+            valeurs = [valeur for valeur in valeurs if valeur in filtres[par]]
+
+        lignes = []
+        for valeur in valeurs:
+            _, esquisse = self.query(mesure, **{**filtres, par: [valeur]})
+            lignes.append({par: valeur, 'min': esquisse.min, 'max': esquisse.max, 'projets': esquisse.count,
+                           **{f"q{round(q * 100)}": esquisse.quantile(q) for q in quantiles}})
+        return pd.DataFrame(lignes)
@@ -0,0 +1,98 @@
+# trade_matrix.py
+import numpy as np
+import pandas as pd
+
+FLUX = ['export', 'import']
+
+
+class TradeMatrix:
+    """Échanges détaillés mois × produit × partenaire × flux
+
+    Les données sont stockées sous forme de tableaux codés (une ligne par
+    cellule non nulle : codes entiers + valeur en float32). Un index de sommes
+    cumulées sur l'axe des mois permet d'obtenir le total de n'importe quelle
+    période en O(produits × partenaires), indépendamment de sa longueur.
+    """
+
+    def __init__(self, mois, produits, partenaires, code_mois, code_produit, code_partenaire, code_flux, valeurs):
+        self.mois = np.asarray(mois, dtype='datetime64[M]')
+        self.produits = list(produits)
+        self.partenaires = list(partenaires)
+        self._index_produits = {produit: i for i, produit in enumerate(self.produits)}
+        self._index_partenaires = {partenaire: i for i, partenaire in enumerate(self.partenaires)}
+
+        self.code_mois = np.asarray(code_mois, dtype=np.int16)
+        self.code_produit = np.asarray(code_produit, dtype=np.int8)
+        self.code_partenaire = np.asarray(code_partenaire, dtype=np.int8)
+        self.code_flux = np.asarray(code_flux, dtype=np.int8)
+        self.valeurs = np.asarray(valeurs, dtype=np.float32)
+
+        self._cumul = self._indexer()
+
+    @classmethod
+    def from_cube(cls, dates, produits, partenaires, cube):
+        """Construit la matrice à partir d'un cube dense (mois, produit, partenaire, flux)"""
+        non_nuls = np.nonzero(cube)
+        return cls(pd.DatetimeIndex(dates).values, produits, partenaires, *non_nuls, cube[non_nuls])
+
+    def _indexer(self):
+        """Sommes cumulées par mois : cumul[i] = total des i premiers mois"""
+        forme = (len(self.mois), len(self.produits), len(self.partenaires), len(FLUX))
+        cube = np.zeros(forme)
+        np.add.at(cube, (self.code_mois, self.code_produit, self.code_partenaire, self.code_flux), self.valeurs)
+
+        cumul = np.zeros((forme[0] + 1,) + forme[1:])
+        np.cumsum(cube, axis=0, out=cumul[1:])
+        return cumul
+
+    def totals(self, date_debut=None, date_fin=None):
+        """Totaux (produit, partenaire, flux) sur une période, par recherche dichotomique"""
+        debut = 0 if date_debut is None else np.searchsorted(
+            self.mois, np.datetime64(pd.Timestamp(date_debut), 'M'), side='left')
+        fin = len(self.mois) if date_fin is None else np.searchsorted(
+            self.mois, np.datetime64(pd.Timestamp(date_fin), 'M'), side='right')
+        return self._cumul[max(fin, debut)] - self._cumul[debut]
+
+    def top_partners(self, produit, date_debut=None, date_fin=None, k=5):
+        """Principaux partenaires pour un produit, avec leur part des échanges du produit"""
+        valeurs = self.totals(date_debut, date_fin)[self._index_produits[produit]].sum(axis=1)
+        return self._top(valeurs, self.partenaires, 'partenaire', k)
+
+    def top_products(self, partenaire, flux, date_debut=None, date_fin=None, k=5):
+        """Principaux produits échangés avec un partenaire dans un sens donné"""
+        valeurs = self.totals(date_debut, date_fin)[:, self._index_partenaires[partenaire], FLUX.index(flux)]
+        return self._top(valeurs, self.produits, 'produit', k)
+
+    def share_of_trade(self, flux, par='partenaire', date_debut=None, date_fin=None):
+        """Part de chaque partenaire (ou produit) dans les exportations ou importations"""
+        totaux = self.totals(date_debut, date_fin)[..., FLUX.index(flux)]
+        if par == 'partenaire':
+            valeurs, libelles = totaux.sum(axis=0), self.partenaires
+        else:
+            valeurs, libelles = totaux.sum(axis=1), self.produits
+
+        table = pd.DataFrame({par: libelles, 'valeur': valeurs})
+        table = table[table['valeur'] > 0].sort_values('valeur', ascending=False)
+        table['part'] = table['valeur'] / table['valeur'].sum() * 100
+        return table.reset_index(drop=True)
+
+    def principal(self, flux=None):
+        """Produit et partenaire dominants de chaque mois, pour un flux ou tous flux confondus"""
+        cube = np.diff(self._cumul, axis=0)
+        cube = cube.sum(axis=3) if flux is None else cube[..., FLUX.index(flux)]
+        produits = np.asarray(self.produits)[cube.sum(axis=2).argmax(axis=1)]
+        partenaires = np.asarray(self.partenaires)[cube.sum(axis=1).argmax(axis=1)]
+        return produits, partenaires
+
+    def _top(self, valeurs, libelles, colonne, k):
+        """Top-k par sélection partielle (argpartition) puis tri des seuls k retenus"""
+        k = min(k, int((valeurs > 0).sum()))
+        if k == 0:
+            return pd.DataFrame({colonne: [], 'valeur': [], 'part': []})
+        selection = np.argpartition(-valeurs, k - 1)[:k]
+        selection = selection[np.argsort(-valeurs[selection])]
+        return pd.DataFrame({
+            colonne: np.asarray(libelles)[selection],
+            'valeur': valeurs[selection],
+            'part': valeurs[selection] / valeurs.sum() * 100
+        })
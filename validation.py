@@ -0,0 +1,197 @@
+# validation.py
+import numpy as np
+import pandas as pd
+
+COLONNES_RAPPORT = ['dataset', 'date', 'colonne', 'regle', 'gravite', 'valeur']
+
+
+class Plage:
+    """Valeurs attendues dans [minimum, maximum] ; '*' désigne toutes les colonnes numériques"""
+
+    def __init__(self, colonnes, minimum=None, maximum=None, gravite='erreur'):
+        self.colonnes = colonnes
+        self.minimum = minimum
+        self.maximum = maximum
+        self.gravite = gravite
+
+    def evaluer(self, lignes, contexte):
+        colonnes = (list(lignes.select_dtypes('number').columns) if self.colonnes == '*'
+                    else [c for c in np.atleast_1d(self.colonnes) if c in lignes.columns])
+        for colonne in colonnes:
+            valeurs = lignes[colonne].to_numpy(dtype=float)
+            if self.minimum is not None:
+                yield colonne, f"< {self.minimum}", self.gravite, valeurs < self.minimum
+            if self.maximum is not None:
+                yield colonne, f"> {self.maximum}", self.gravite, valeurs > self.maximum
+
+
+class Requis:
+    """Valeurs manquantes (NaN) interdites"""
+
+    def __init__(self, colonnes='*', gravite='avertissement'):
+        self.colonnes = colonnes
+        self.gravite = gravite
+
+    def evaluer(self, lignes, contexte):
+        colonnes = lignes.columns if self.colonnes == '*' else np.atleast_1d(self.colonnes)
+        for colonne in colonnes:
+            yield colonne, "valeur manquante", self.gravite, lignes[colonne].isna().to_numpy()
+
+
+class Valeurs:
+    """Valeurs limitées à un ensemble fermé"""
+
+    def __init__(self, colonne, autorisees, gravite='erreur'):
+        self.colonne = colonne
+        self.autorisees = list(autorisees)
+        self.gravite = gravite
+
+    def evaluer(self, lignes, contexte):
+        yield self.colonne, "valeur inconnue", self.gravite, ~np.isin(lignes[self.colonne].to_numpy(), self.autorisees)
+
+
+class Relation:
+    """Colonne égale à une expression des autres colonnes (à une tolérance près)"""
+
+    def __init__(self, colonne, expression, tolerance=1e-6, gravite='avertissement'):
+        self.colonne = colonne
+        self.expression = expression
+        self.tolerance = tolerance
+        self.gravite = gravite
+
+    def evaluer(self, lignes, contexte):
+        attendu = np.asarray(self.expression(lignes), dtype=float)
+        ecart = np.abs(lignes[self.colonne].to_numpy(dtype=float) - attendu)
+        yield self.colonne, "incohérence", self.gravite, ecart > self.tolerance
+
+
+class SuiteMensuelle:
+    """Une ligne par mois, datée de la fin du mois, sans mois manquant
+
+    Les mois déjà vus sont conservés dans le contexte (tableau trié) : un lot
+    n'est comparé à l'historique que par recherche dichotomique. Une ligne à la
+    date exacte d'un mois connu est une révision, pas un doublon.
+    """
+
+    def __init__(self, colonne='date'):
+        self.colonne = colonne
+
+    def evaluer(self, lignes, contexte):
+        dates = lignes[self.colonne].to_numpy().astype('datetime64[D]')
+        mois = dates.astype('datetime64[M]').astype(np.int64)
+        connus = contexte.get('mois', np.empty(0, dtype=np.int64))
+        dates_connues = contexte.get('dates', np.empty(0, dtype='datetime64[D]'))
+
+        # Mois déjà présents dans l'historique, avec une autre date
+        position = np.minimum(np.searchsorted(connus, mois), max(len(connus) - 1, 0))
+        existe = (connus[position] == mois) if len(connus) else np.zeros(len(mois), dtype=bool)
+        doublon = existe & (dates_connues[position] != dates) if len(connus) else existe.copy()
+
+        # Mois répétés au sein du lot
+        ordre = np.argsort(mois, kind='stable')
+        doublon[ordre[1:]] |= mois[ordre[1:]] == mois[ordre[:-1]]
+
+        # Mois manquant juste avant chaque mois reçu
+        tous = np.union1d(connus, mois)
+        rang = np.searchsorted(tous, mois)
+        lacune = (rang > 0) & (mois - tous[np.maximum(rang - 1, 0)] > 1)
+
+        fin_de_mois = (mois + 1).astype('datetime64[M]').astype('datetime64[D]') - np.timedelta64(1, 'D')
+
+        yield self.colonne, "mois en double", 'erreur', doublon
+        yield self.colonne, "mois manquant avant", 'avertissement', lacune
+        yield self.colonne, "date hors fin de mois", 'avertissement', dates != fin_de_mois
+
+        # Mémorisation des nouveaux mois (première date rencontrée)
+        nouveaux, premiers = np.unique(mois[~existe], return_index=True)
+        positions = np.searchsorted(connus, nouveaux)
+        contexte['mois'] = np.insert(connus, positions, nouveaux)
+        contexte['dates'] = np.insert(dates_connues, positions, dates[~existe][premiers])
+
+
+REGLES = {
+    'economic_data': [
+        SuiteMensuelle(),
+        Requis(),
+        Plage(['pib_mensuel', 'taux_change_usd', 'reserves_devises', 'dette_publique', 'taux_chomage'], minimum=0),
+        Plage(['taux_chomage', 'inflation'], maximum=100)
+    ],
+    'tourism_data': [
+        SuiteMensuelle(),
+        Requis(),
+        Plage(['arrivees_touristes', 'recettes_tourisme', 'duree_sejour_moyenne'], minimum=0),
+        Plage('taux_occupation_hotels', minimum=0, maximum=1)
+    ],
+    'tourism_markets': [
+        SuiteMensuelle(),
+        Requis(),
+        Plage('*', minimum=0)
+    ],
+    'trade_data': [
+        SuiteMensuelle(),
+        Requis(),
+        Plage(['exportations', 'importations'], minimum=0),
+        Relation('balance_commerciale', lambda lignes: lignes['exportations'] - lignes['importations'])
+    ],
+    'investment_data': [
+        Requis(),
+        Plage(['montant_usd_millions', 'emplois_crees'], minimum=0),
+        Valeurs('statut', ['Approuvé', 'En cours', 'Terminé'])
+    ]
+}
+
+
+class DataQualityValidator:
+    """Contrôle qualité déclaratif, évalué par masques NumPy sur les seules lignes reçues
+
+    Chaque règle produit un masque booléen par colonne contrôlée ; le rapport
+    conserve une ligne par anomalie. Une période révisée remplace ses anomalies
+    précédentes, l'historique n'est jamais réévalué.
+    """
+
+    def __init__(self, regles=None):
+        self.regles = REGLES if regles is None else regles
+        self._contextes = {}
+        self._rapports = {}
+
+    def validate(self, nom, lignes, colonne_date='date'):
+        """Évalue les règles du jeu de données sur un lot de lignes et met à jour le rapport"""
+        contexte = self._contextes.setdefault(nom, {})
+        dates = lignes[colonne_date].to_numpy()
+        anomalies = []
+
+        for regle in self.regles.get(nom, []):
+            for colonne, libelle, gravite, masque in regle.evaluer(lignes, contexte):
+                if masque.any():
+                    anomalies.append(pd.DataFrame({
+                        'dataset': nom,
+                        'date': dates[masque],
+                        'colonne': colonne,
+                        'regle': libelle,
+                        'gravite': gravite,
+                        'valeur': lignes[colonne].astype(str).to_numpy()[masque]
+                    }))
+
+        nouvelles = pd.concat(anomalies, ignore_index=True) if anomalies else pd.DataFrame(columns=COLONNES_RAPPORT)
+        rapport = self._rapports.get(nom)
+        if rapport is not None and colonne_date == 'date':
+            # Les périodes révisées remplacent leurs anomalies précédentes
+            rapport = rapport[~rapport['date'].isin(dates)]
+        self._rapports[nom] = nouvelles if rapport is None or rapport.empty else pd.concat([rapport, nouvelles], ignore_index=True)
+        return nouvelles
+
+    def report(self, nom=None, date_debut=None, date_fin=None):
+        """Anomalies connues, éventuellement filtrées par jeu de données et période"""
+        rapports = [self._rapports[nom]] if nom is not None else list(self._rapports.values())
+        rapport = pd.concat(rapports, ignore_index=True) if rapports else pd.DataFrame(columns=COLONNES_RAPPORT)
+        if date_debut is not None:
+            rapport = rapport[rapport['date'] >= pd.Timestamp(date_debut)]
+        if date_fin is not None:
+            rapport = rapport[rapport['date'] <= pd.Timestamp(date_fin)]
+        return rapport.reset_index(drop=True)
+
+    def summary(self):
+        """Nombre d'anomalies par jeu de données, règle et gravité"""
+        rapport = self.report()
+        return (rapport.groupby(['dataset', 'colonne', 'regle', 'gravite']).size()
+                .rename('anomalies').reset_index().sort_values('anomalies', ascending=False))
@@ -0,0 +1,292 @@
+# vintages.py
+import bisect
+import hashlib
+import json
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+class VintageStore:
+    """Historique des millésimes de chaque jeu de données, à partage structurel
+
+    Chaque colonne est découpée en blocs de `taille_bloc` lignes identifiés par
+    leur empreinte. Un millésime ne conserve que les empreintes qui suivent le
+    préfixe commun avec son parent : les blocs inchangés sont partagés entre
+    millésimes, et le stockage ne croît qu'avec les blocs effectivement révisés
+    ou ajoutés. Toutes les `profondeur_max` générations, un millésime complet
+    borne la remontée des parents. Les millésimes provisoires (flux live) d'une
+    même fenêtre de `fenetre_provisoire` secondes sont fusionnés en un seul.
+    """
+
+    def __init__(self, taille_bloc=32, lectures_en_cache=16, fenetre_provisoire=300, profondeur_max=32):
+        self.taille_bloc = taille_bloc
+        self.lectures_en_cache = lectures_en_cache
+        self.fenetre_provisoire = fenetre_provisoire
+        self.profondeur_max = profondeur_max
+        self._blocs = {}
+        self._references = Counter()
+        self._millesimes = {}
+        self._horodatages = {}
+        self._lectures = OrderedDict()
+        self._verrou = threading.Lock()
+
+    def commit(self, nom, frame, depuis=0, cle='date', horodatage=None, provisoire=False):
+        """Enregistre un nouveau millésime ; les lignes avant `depuis` sont supposées inchangées
+
+        Un millésime provisoire remplace le précédent s'il est lui aussi provisoire
+        et que sa fenêtre est encore ouverte.
+        """
+        with self._verrou:
+            millesimes = self._millesimes.setdefault(nom, [])
+            horodatage = horodatage or datetime.now()
+            ouverture = horodatage
+            if (provisoire and len(millesimes) > 1 and millesimes[-1]['provisoire']
+                    and (horodatage - millesimes[-1]['ouverture']).total_seconds() < self.fenetre_provisoire):
+                remplace = self._retirer_dernier(nom)
+                depuis = min(depuis, remplace['prefixe'] * self.taille_bloc)
+                ouverture = remplace['ouverture']
+
+            precedent = millesimes[-1] if millesimes else None
+            premier_bloc, anciennes = 0, None
+            if precedent is not None and list(precedent['colonnes']) == list(frame.columns):
+                premier_bloc = min(depuis, precedent['lignes'], len(frame)) // self.taille_bloc
+                anciennes = {colonne: self._empreintes(nom, precedent['numero'], colonne) for colonne in frame.columns}
+
+            queues = {}
+            octets_nouveaux = 0
+            for colonne in frame.columns:
+                valeurs = frame[colonne].to_numpy()
+                empreintes = []
+                for debut in range(premier_bloc * self.taille_bloc, len(valeurs), self.taille_bloc):
+                    bloc = valeurs[debut:debut + self.taille_bloc]
+                    empreinte = self._empreinte(bloc)
+                    if empreinte not in self._blocs:
+                        # Toujours copié : une vue garderait projetée la version partagée d'origine
+                        self._blocs[empreinte] = bloc.copy()
+                        octets_nouveaux += bloc.nbytes
+                    empreintes.append(empreinte)
+                queues[colonne] = empreintes
+
+            if anciennes is not None and all(queues[c] == anciennes[c][premier_bloc:] for c in frame.columns):
+                return precedent['numero']
+
+            # Chaîne de parents bornée : au-delà, le millésime est conservé en entier
+            profondeur = precedent['profondeur'] + 1 if precedent is not None else 0
+            if profondeur > self.profondeur_max:
+                queues = {c: anciennes[c][:premier_bloc] + queues[c] for c in frame.columns}
+                premier_bloc = 0
+            if premier_bloc == 0:
+                profondeur = 0
+            for empreintes in queues.values():
+                self._references.update(empreintes)
+
+            # Horodatages croissants, pour la recherche dichotomique
+            if millesimes:
+                horodatage = max(horodatage, millesimes[-1]['horodatage'])
+            millesimes.append({
+                'numero': len(millesimes),
+                'horodatage': horodatage,
+                'ouverture': ouverture,
+                'provisoire': provisoire,
+                'lignes': len(frame),
+                'cle': cle,
+                'parent': precedent['numero'] if profondeur else None,
+                'prefixe': premier_bloc,
+                'profondeur': profondeur,
+                'colonnes': queues,
+                'octets_nouveaux': octets_nouveaux
+            })
+            self._horodatages.setdefault(nom, []).append(horodatage)
+            return len(millesimes) - 1
+
+    def to_tables(self):
+        """Blocs et index des millésimes en tables, pour publication en mémoire partagée (voir shared_data.py)
+
+        Les blocs d'un même type sont mis bout à bout en une seule table ;
+        l'index associe chaque empreinte à sa tranche. `from_tables` relit ces
+        tables sans copier les blocs.
+        """
+        with self._verrou:
+            groupes = {}
+            for empreinte, bloc in self._blocs.items():
+                groupes.setdefault(str(bloc.dtype), []).append((empreinte, bloc))
+
+            tables, index = {}, []
+            for groupe, blocs in enumerate(groupes.values()):
+                tables[f'vintages_blocs_{groupe}'] = pd.DataFrame({'valeurs': np.concatenate([bloc for _, bloc in blocs])})
+                debut = 0
+                for empreinte, bloc in blocs:
+                    index.append((empreinte.hex(), groupe, debut, debut + len(bloc)))
+                    debut += len(bloc)
+            tables['vintages_index'] = pd.DataFrame(index, columns=['empreinte', 'groupe', 'debut', 'fin'])
+
+            millesimes, empreintes = [], []
+            for nom, liste in self._millesimes.items():
+                for m in liste:
+                    millesimes.append({
+                        'nom': nom, 'numero': m['numero'], 'horodatage': m['horodatage'], 'ouverture': m['ouverture'],
+                        'provisoire': m['provisoire'], 'lignes': m['lignes'], 'cle': m['cle'],
+                        'parent': -1 if m['parent'] is None else m['parent'], 'prefixe': m['prefixe'],
+                        'profondeur': m['profondeur'], 'octets_nouveaux': m['octets_nouveaux'],
+                        'colonnes': json.dumps(list(m['colonnes']), ensure_ascii=False)
+                    })
+                    empreintes.extend((nom, m['numero'], colonne, empreinte.hex())
+                                      for colonne, liste_empreintes in m['colonnes'].items() for empreinte in liste_empreintes)
+            tables['vintages'] = pd.DataFrame(millesimes)
+            tables['vintages_empreintes'] = pd.DataFrame(empreintes, columns=['nom', 'numero', 'colonne', 'empreinte'])
+            return tables
+
+    @classmethod
+    def from_tables(cls, tables, **options):
+        """Historique en lecture seule sur des tables publiées par `to_tables` (blocs projetés, sans copie)"""
+        store = cls(**options)
+        index = tables['vintages_index']
+        groupes = {}
+        for empreinte, groupe, debut, fin in zip(index['empreinte'], index['groupe'], index['debut'], index['fin']):
+            if groupe not in groupes:
+                groupes[groupe] = tables[f'vintages_blocs_{groupe}']['valeurs'].to_numpy()
+            store._blocs[bytes.fromhex(empreinte)] = groupes[groupe][debut:fin]
+
+        queues = {}
+        lignes = tables['vintages_empreintes']
+        for nom, numero, colonne, empreinte in zip(lignes['nom'], lignes['numero'], lignes['colonne'], lignes['empreinte']):
+            queues.setdefault((nom, int(numero)), {}).setdefault(colonne, []).append(bytes.fromhex(empreinte))
+
+        for m in tables['vintages'].to_dict('records'):
+            nom, numero = m['nom'], int(m['numero'])
+            horodatage = pd.Timestamp(m['horodatage']).to_pydatetime()
+            store._millesimes.setdefault(nom, []).append({
+                'numero': numero,
+                'horodatage': horodatage,
+                'ouverture': pd.Timestamp(m['ouverture']).to_pydatetime(),
+                'provisoire': bool(m['provisoire']),
+                'lignes': int(m['lignes']),
+                'cle': m['cle'],
+                'parent': None if m['parent'] < 0 else int(m['parent']),
+                'prefixe': int(m['prefixe']),
+                'profondeur': int(m['profondeur']),
+                'colonnes': {colonne: queues.get((nom, numero), {}).get(colonne, [])
+                             for colonne in json.loads(m['colonnes'])},
+                'octets_nouveaux': int(m['octets_nouveaux'])
+            })
+            store._horodatages.setdefault(nom, []).append(horodatage)
+        return store
+
+    def vintages(self, nom):
+        """Millésimes d'un jeu de données : numéro, horodatage, lignes, octets ajoutés"""
+        return pd.DataFrame([{cle: m[cle] for cle in ('numero', 'horodatage', 'lignes', 'octets_nouveaux')}
+                             for m in self._millesimes.get(nom, [])])
+
+    def latest(self, nom):
+        """Numéro du dernier millésime"""
+        return len(self._millesimes[nom]) - 1
+
+    def vintage_at(self, nom, moment):
+        """Numéro du millésime en vigueur à un instant donné"""
+        position = bisect.bisect_right(self._horodatages.get(nom, []), pd.Timestamp(moment).to_pydatetime()) - 1
+        if position < 0:
+            raise LookupError(f"Aucun millésime de {nom} au {moment}")
+        return position
+
+    def get(self, nom, numero, colonnes=None):
+        """Jeu de données tel qu'au millésime demandé"""
+        with self._verrou:
+            millesime = self._millesimes[nom][numero]
+            colonnes = list(millesime['colonnes']) if colonnes is None else list(colonnes)
+            cle = (nom, numero, tuple(colonnes))
+            if cle in self._lectures:
+                self._lectures.move_to_end(cle)
+                return self._lectures[cle]
+
+            frame = pd.DataFrame({
+                colonne: np.concatenate([self._blocs[empreinte] for empreinte in self._empreintes(nom, numero, colonne)])
+                for colonne in colonnes
+            })
+            self._lectures[cle] = frame
+            if len(self._lectures) > self.lectures_en_cache:
+                self._lectures.popitem(last=False)
+            return frame
+
+    def as_of(self, nom, moment, colonnes=None):
+        """Jeu de données tel qu'il était connu à un instant donné"""
+        return self.get(nom, self.vintage_at(nom, moment), colonnes)
+
+    def diff(self, nom, ancien, nouveau):
+        """Révisions des colonnes numériques entre deux millésimes (date, colonne, avant, après, révision)
+
+        Seuls les blocs dont l'empreinte diffère sont comparés.
+        """
+        with self._verrou:
+            avant, apres = self._millesimes[nom][ancien], self._millesimes[nom][nouveau]
+            cle = apres['cle']
+            communes = [c for c in apres['colonnes'] if c in avant['colonnes']]
+            empreintes_avant = {c: self._empreintes(nom, ancien, c) for c in communes}
+            empreintes_apres = {c: self._empreintes(nom, nouveau, c) for c in communes}
+
+        nb_blocs = max(len(empreintes_avant[cle]), len(empreintes_apres[cle]))
+        modifies = np.zeros(nb_blocs, dtype=bool)
+        for colonne in communes:
+            a, b = empreintes_avant[colonne], empreintes_apres[colonne]
+            modifies[min(len(a), len(b)):] = True
+            modifies[:min(len(a), len(b))] |= np.array([x != y for x, y in zip(a, b)], dtype=bool)
+
+        def lignes_modifiees(numero, empreintes):
+            frame = self.get(nom, numero, communes)
+            masque = np.repeat(modifies[:len(empreintes[cle])], self.taille_bloc)[:len(frame)]
+            return frame[masque].set_index(cle).select_dtypes('number')
+
+        anciennes, nouvelles = lignes_modifiees(ancien, empreintes_avant), lignes_modifiees(nouveau, empreintes_apres)
+        revisions = (anciennes.stack(dropna=False).rename('avant').to_frame()
+                     .join(nouvelles.stack(dropna=False).rename('apres'), how='outer'))
+        identiques = (revisions['avant'] == revisions['apres']) | (revisions['avant'].isna() & revisions['apres'].isna())
+        revisions = revisions[~identiques]
+        revisions['revision'] = revisions['apres'] - revisions['avant']
+        return revisions.rename_axis([cle, 'colonne']).reset_index()
+
+    def stats(self):
+        """Taille stockée (blocs uniques, empreintes) comparée à la taille cumulée de tous les millésimes"""
+        with self._verrou:
+            tailles = {empreinte: bloc.nbytes for empreinte, bloc in self._blocs.items()}
+            logique = sum(tailles[e] for nom, millesimes in self._millesimes.items() for m in millesimes
+                          for colonne in m['colonnes'] for e in self._empreintes(nom, m['numero'], colonne))
+            return {
+                'millesimes': sum(len(m) for m in self._millesimes.values()),
+                'blocs': len(self._blocs),
+                'octets_stockes': sum(tailles.values()),
+                'empreintes_stockees': sum(len(e) for millesimes in self._millesimes.values()
+                                           for m in millesimes for e in m['colonnes'].values()),
+                'octets_logiques': logique
+            }
+
+    def _empreintes(self, nom, numero, colonne):
+        """Empreintes complètes d'une colonne, reconstituées en remontant les parents"""
+        millesimes = self._millesimes[nom]
+        chaine = [millesimes[numero]]
+        while chaine[-1]['parent'] is not None:
+            chaine.append(millesimes[chaine[-1]['parent']])
+        empreintes = []
+        for millesime in reversed(chaine):
+            empreintes = empreintes[:millesime['prefixe']] + millesime['colonnes'][colonne]
+        return empreintes
+
+    def _retirer_dernier(self, nom):
+        """Supprime le dernier millésime (remplacé par fusion) et les blocs qu'il était seul à référencer"""
+        millesime = self._millesimes[nom].pop()
+        self._horodatages[nom].pop()
+        for empreintes in millesime['colonnes'].values():
+            self._references.subtract(empreintes)
+            for empreinte in empreintes:
+                if self._references[empreinte] <= 0:
+                    self._references.pop(empreinte, None)
+                    self._blocs.pop(empreinte, None)
+        for cle in [cle for cle in self._lectures if cle[:2] == (nom, millesime['numero'])]:
+            del self._lectures[cle]
+        return millesime
+
+    @staticmethod
+    def _empreinte(bloc):
+        return hashlib.blake2b(str(bloc.dtype).encode() + pd.util.hash_array(bloc).tobytes(), digest_size=16).digest()